@@ -2,3 +2,5 @@ pip install colorama
 pip install PyAutoGUI
 pip install keyboard
 pip install requests
+pip install numpy
+pip install mss
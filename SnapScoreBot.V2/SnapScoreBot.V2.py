@@ -1,12 +1,13 @@
-import sys
-import platform
-import os
 import time
+STARTUP_T0 = time.perf_counter()
+
+import sys
 import json
-import threading
-import random
+import shutil
+import argparse
+import tempfile
+import importlib.util
 from pathlib import Path
-from datetime import datetime
 
 # ==================== MODULE CHECK ====================
 required_modules = {
@@ -16,298 +17,69 @@ required_modules = {
     'requests': 'requests'
 }
 
-missing_modules = []
-for module in required_modules.values():
-    try:
-        __import__(module)
-    except ImportError:
-        missing_modules.append(module)
-
-if missing_modules:
-    print("Error: Missing required modules detected")
-    print("Please run 'Install_Requirements.bat' first")
-    print("\nMissing modules:")
-    for mod in missing_modules:
-        print(f" - {mod}")
-    input("\nPress ENTER to exit...")
-    sys.exit(1)
-
-# Now import the modules
-import pyautogui
-import keyboard
-import requests
-from colorama import Fore, init, Style
+def missing_modules(modules=None):
+    """Returns the modules that are not installed.
 
-# Initialize colorama
-init(autoreset=True, convert=True)
+    Only looks the modules up, so the check does not pay for importing them.
+    """
+    modules = required_modules.values() if modules is None else modules
+    return [module for module in modules if importlib.util.find_spec(module) is None]
 
-# ==================== SETTINGS ====================
-TUTORIAL_VIDEO = "Soon"
-VERSION = "2.0.0"
-CREDITS = "Eddie-500 - Educational Purpose Only"
-CONFIG_FILE = "config.json"
-
-# ==================== HELPER FUNCTIONS ====================
-def clear():
-    """Clears the console"""
-    if platform.system() == "Windows":
-        os.system("cls")
-    else:
-        os.system("clear")
-
-def title(text):
-    """Sets the console window title"""
-    if sys.platform.startswith('win'):
-        import ctypes
-        try:
-            ctypes.windll.kernel32.SetConsoleTitleW(text)
-        except:
-            pass
-
-def nice_print(text, status="-", color=Fore.WHITE):
-    """Formatted print with status icon"""
-    print(f"{Fore.WHITE}[{Fore.RED}{status}{Fore.WHITE}] {color}{text}")
-
-def print_banner():
-    """Prints the program banner"""
-    banner = rf"""
-{Fore.RED}
-    ┏━┓┏┓╻┏━┓┏━┓┏━┓┏━╸┏━┓┏━┓┏━╸┏┓ ┏━┓╺┳╸
-    ┗━┓┃┗┫┣━┫┣━┛┗━┓┃  ┃ ┃┣┳┛┣╸ ┣┻┓┃ ┃ ┃ 
-    ┗━┛╹ ╹╹ ╹╹  ┗━┛┗━╸┗━┛╹┗╸┗━╸┗━┛┗━┛ ╹ 
-                   
-{Fore.YELLOW}             Version {VERSION}
-{Fore.CYAN}Educational Purpose Only - By: Eddie-500 GITHUB
-{Fore.WHITE}═════════════════════════════════════════════════════
-"""
-    print(banner)
+def check_modules(modules=None):
+    """Exits with instructions if a required module is missing"""
+    missing = missing_modules(modules)
+    if missing:
+        print("Error: Missing required modules detected")
+        print("Please run 'Install_Requirements.bat' first")
+        print("\nMissing modules:")
+        for mod in missing:
+            print(f" - {mod}")
+        input("\nPress ENTER to exit...")
+        sys.exit(1)
 
-# ==================== CONFIGURATION CLASS ====================
-class Config:
-    def __init__(self):
-        self.loop_delay = 5
-        self.click_delay = 1.2
-        self.position_delay = 0.5
-        self.random_delay = False
-        self.random_delay_min = 3
-        self.random_delay_max = 8
-        self.auto_stop_enabled = False
-        self.auto_stop_after = 100
-        self.load_config()
-    
-    def load_config(self):
-        """Loads configuration from JSON file"""
-        if Path(CONFIG_FILE).exists():
-            try:
-                with open(CONFIG_FILE, 'r') as f:
-                    data = json.load(f)
-                    for key, value in data.items():
-                        if hasattr(self, key):
-                            setattr(self, key, value)
-                nice_print("Configuration loaded", "✓", Fore.GREEN)
-            except:
-                pass
-    
-    def save_config(self):
-        """Saves configuration to JSON file"""
-        data = {
-            'loop_delay': self.loop_delay,
-            'click_delay': self.click_delay,
-            'position_delay': self.position_delay,
-            'random_delay': self.random_delay,
-            'random_delay_min': self.random_delay_min,
-            'random_delay_max': self.random_delay_max,
-            'auto_stop_enabled': self.auto_stop_enabled,
-            'auto_stop_after': self.auto_stop_after
-        }
-        with open(CONFIG_FILE, 'w') as f:
-            json.dump(data, f, indent=4)
-        nice_print("Configuration saved", "✓", Fore.GREEN)
+# Every command needs colorama, so it is checked before the imports below;
+# the menu checks the other modules once the arguments are parsed
+if __name__ == "__main__":
+    check_modules(('colorama',))
 
-# ==================== STATISTICS CLASS ====================
-class Statistics:
-    def __init__(self):
-        self.total_snaps_sent = 0
-        self.session_snaps = 0
-        self.start_time = None
-        self.errors_count = 0
-        self.stats_file = "stats.json"
-        self.load_stats()
-    
-    def load_stats(self):
-        """Loads previous statistics"""
-        if Path(self.stats_file).exists():
-            try:
-                with open(self.stats_file, 'r') as f:
-                    data = json.load(f)
-                    self.total_snaps_sent = data.get('total_snaps_sent', 0)
-            except:
-                pass
-    
-    def save_stats(self):
-        """Saves statistics"""
-        data = {
-            'total_snaps_sent': self.total_snaps_sent,
-            'last_session': datetime.now().isoformat(),
-            'last_session_snaps': self.session_snaps
-        }
-        with open(self.stats_file, 'w') as f:
-            json.dump(data, f, indent=4)
-    
-    def get_elapsed_time(self):
-        """Gets formatted elapsed time"""
-        if self.start_time:
-            elapsed = time.time() - self.start_time
-            hours = int(elapsed // 3600)
-            minutes = int((elapsed % 3600) // 60)
-            seconds = int(elapsed % 60)
-            return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
-        return "00:00:00"
+from colorama import Fore, init
 
-# ==================== SNAP BOT CORE ====================
-class AdvancedSnapBot:
-    def __init__(self, config, stats):
-        self.config = config
-        self.stats = stats
-        self.positions = {}
-        self.is_running = False
-        self.first_try = True
-        self.pause_bot = False
-        
-    def get_positions(self):
-        """Captures mouse positions"""
-        positions_needed = [
-            ('camera', 'Camera button'),
-            ('send_to', 'Send to button'),
-            ('shortcut', 'Shortcut button'),
-            ('select_all', 'Select All button')
-        ]
-        
-        for key, description in positions_needed:
-            nice_print(f"Move the mouse to the {description} and press F", "→", Fore.YELLOW)
-            
-            while True:
-                if keyboard.is_pressed("f"):
-                    self.positions[key] = pyautogui.position()
-                    nice_print(f"Position saved: {self.positions[key]}", "✓", Fore.GREEN)
-                    time.sleep(self.config.position_delay)
-                    break
-                if keyboard.is_pressed("escape"):
-                    return False
-        
-        self.save_positions()
-        return True
-    
-    def save_positions(self):
-        """Saves positions to a JSON file"""
-        positions_data = {k: {'x': v.x, 'y': v.y} for k, v in self.positions.items()}
-        with open('positions.json', 'w') as f:
-            json.dump(positions_data, f)
-        nice_print("Positions saved to file", "✓", Fore.GREEN)
-    
-    def load_positions(self):
-        """Loads previously saved positions"""
-        if Path('positions.json').exists():
-            try:
-                with open('positions.json', 'r') as f:
-                    data = json.load(f)
-                    for key, coords in data.items():
-                        self.positions[key] = pyautogui.Point(coords['x'], coords['y'])
-                nice_print("Positions loaded from file", "✓", Fore.GREEN)
-                return True
-            except:
-                pass
-        return False
-    
-    def send_snap(self, shortcut_user_count):
-        """Sends a snap sequence"""
-        try:
-            pyautogui.moveTo(self.positions['camera'])
-            if self.first_try:
-                pyautogui.click()
-                self.first_try = False
-            time.sleep(self.get_delay())
+from snapscorebot import (VERSION, AdvancedSnapBot, BotController, Config, ConfigError, Dashboard,
+                          ERROR_LABELS, HotkeyManager, PlanError, SimulatedBackend, Statistics,
+                          VersionChecker, format_rolling, format_status, nice_print)
+from snapscorebot.benchmarks import BENCH_POSITIONS, run_benchmarks
+from snapscorebot.console import clear, print_banner
+from snapscorebot.settings import (TUTORIAL_VIDEO, CREDITS, TIMINGS_FILE, VERSION_CACHE_FILE, CONFIG_FILE,
+                                   ACTIONS_FILE, POSITIONS_FILE)
 
-            pyautogui.click()
-            time.sleep(self.get_delay())
+# ==================== STARTUP TRACE ====================
+startup_marks = []
 
-            pyautogui.moveTo(self.positions['send_to'])
-            pyautogui.click()
-            time.sleep(self.get_delay())
+def mark_startup(label):
+    """Records the time since process start for a startup phase"""
+    startup_marks.append((label, time.perf_counter() - STARTUP_T0))
 
-            pyautogui.moveTo(self.positions['shortcut'])
-            pyautogui.click()
-            time.sleep(self.get_delay())
+def print_startup_trace():
+    """Prints the recorded startup phases"""
+    print(f"{Fore.CYAN}Startup trace:{Fore.WHITE}")
+    for label, at in startup_marks:
+        print(f"   {label:<10} {at * 1000:8.1f} ms")
 
-            pyautogui.moveTo(self.positions['select_all'])
-            pyautogui.click()
-            time.sleep(self.get_delay())
+# ==================== LIVE DASHBOARD ====================
+def show_dashboard(dashboard):
+    """Shows the live dashboard until ENTER is pressed; the bot keeps running.
 
-            pyautogui.moveTo(self.positions['send_to'])
-            pyautogui.click()
+    While the menu is shown, bot messages still land on the dashboard's
+    message line and are seen when it is reopened.
+    """
+    dashboard.start()
+    try:
+        input()
+    finally:
+        dashboard.stop()
+        if not dashboard.controller.running:
+            dashboard.bot.notify = dashboard.bot.hotkeys.notify = nice_print
 
-            self.stats.session_snaps += 1
-            self.stats.total_snaps_sent += shortcut_user_count
-            return True
-            
-        except Exception as e:
-            self.stats.errors_count += 1
-            nice_print(f"Error sending snap: {e}", "✗", Fore.RED)
-            return False
-    
-    def get_delay(self):
-        """Returns a random or fixed delay"""
-        if self.config.random_delay:
-            return random.uniform(self.config.random_delay_min, self.config.random_delay_max)
-        return self.config.click_delay
-    
-    def run_bot(self, shortcut_user_count):
-        """Runs the main bot loop"""
-        self.is_running = True
-        self.stats.start_time = time.time()
-        sent_count = 0
-        
-        nice_print("Bot started. Press 'Q' to stop, 'P' to pause", "!", Fore.CYAN)
-        
-        while self.is_running:
-            if keyboard.is_pressed('q'):
-                nice_print("Stopping bot...", "!", Fore.YELLOW)
-                break
-            
-            if keyboard.is_pressed('p'):
-                self.pause_bot = not self.pause_bot
-                if self.pause_bot:
-                    nice_print("Bot paused. Press 'P' to resume", "||", Fore.YELLOW)
-                else:
-                    nice_print("Bot resumed", "▶", Fore.GREEN)
-                time.sleep(0.5)
-            
-            if self.pause_bot:
-                time.sleep(0.1)
-                continue
-            
-            title(f"SnapScoreBot v{VERSION} | Sent: {self.stats.total_snaps_sent} | Time: {self.stats.get_elapsed_time()}")
-            
-            success = self.send_snap(shortcut_user_count)
-            
-            if success:
-                sent_count += 1
-                clear()
-                print_banner()
-                nice_print(f"Snaps sent this session: {self.stats.session_snaps}", "📊", Fore.CYAN)
-                nice_print(f"Total historical: {self.stats.total_snaps_sent}", "📈", Fore.CYAN)
-                nice_print(f"Elapsed time: {self.stats.get_elapsed_time()}", "⏱", Fore.CYAN)
-                
-                if self.config.auto_stop_enabled and sent_count >= self.config.auto_stop_after:
-                    nice_print(f"Auto-stop reached ({self.config.auto_stop_after} snaps)", "!", Fore.YELLOW)
-                    break
-            
-            loop_delay = random.uniform(self.config.random_delay_min, self.config.random_delay_max) if self.config.random_delay else self.config.loop_delay
-            time.sleep(loop_delay)
-        
-        self.is_running = False
-        self.stats.save_stats()
-        nice_print("Bot stopped", "✓", Fore.GREEN)
 # ==================== CONFIGURATION MENU ====================
 def configuration_menu(config):
     """Interactive configuration menu"""
@@ -324,51 +96,108 @@ def configuration_menu(config):
         print(f"[4] Auto-stop: {Fore.YELLOW}{'Enabled' if config.auto_stop_enabled else 'Disabled'}{Fore.WHITE}")
         if config.auto_stop_enabled:
             print(f"    └─ After: {Fore.YELLOW}{config.auto_stop_after} snaps{Fore.WHITE}")
-        print(f"[5] Save configuration")
+        print(f"[5] Input pause: {Fore.YELLOW}{config.input_pause}s per move/click{Fore.WHITE}")
+        print(f"[6] Profile run (cProfile): {Fore.YELLOW}{'Enabled' if config.profile_enabled else 'Disabled'}{Fore.WHITE}")
+        print(f"[7] Verify positions on screen: {Fore.YELLOW}{'Enabled' if config.verify_screen else 'Disabled'}{Fore.WHITE}")
+        print(f"[8] Save configuration")
         print(f"[0] Return to main menu")
         
         try:
             option = input(f"\n{Fore.RED}> {Fore.WHITE}")
             
             if option == "1":
-                config.loop_delay = float(input("New loop delay (seconds): "))
+                config.apply({'loop_delay': float(input("New loop delay (seconds): "))})
             elif option == "2":
-                config.click_delay = float(input("New click delay (seconds): "))
+                config.apply({'click_delay': float(input("New click delay (seconds): "))})
             elif option == "3":
-                config.random_delay = not config.random_delay
                 if config.random_delay:
-                    config.random_delay_min = float(input("Minimum delay (seconds): "))
-                    config.random_delay_max = float(input("Maximum delay (seconds): "))
+                    config.apply({'random_delay': False})
+                else:
+                    config.apply({'random_delay': True,
+                                  'random_delay_min': float(input("Minimum delay (seconds): ")),
+                                  'random_delay_max': float(input("Maximum delay (seconds): "))})
             elif option == "4":
-                config.auto_stop_enabled = not config.auto_stop_enabled
                 if config.auto_stop_enabled:
-                    config.auto_stop_after = int(input("Stop after how many snaps: "))
+                    config.apply({'auto_stop_enabled': False})
+                else:
+                    config.apply({'auto_stop_enabled': True,
+                                  'auto_stop_after': int(input("Stop after how many snaps: "))})
             elif option == "5":
+                config.apply({'input_pause': float(input("Pause after each move/click (seconds): "))})
+            elif option == "6":
+                config.apply({'profile_enabled': not config.profile_enabled})
+            elif option == "7":
+                config.apply({'verify_screen': not config.verify_screen})
+            elif option == "8":
                 config.save_config()
                 input("Press ENTER to continue...")
             elif option == "0":
                 break
+        except ConfigError as e:
+            nice_print(f"Invalid value: {e}", "✗", Fore.RED)
+            input("Press ENTER to continue...")
         except ValueError:
             nice_print("Invalid value", "✗", Fore.RED)
             input("Press ENTER to continue...")
 
 # ==================== STATISTICS MENU ====================
-def statistics_menu(stats):
+def print_step_timings(stats, config, plan=None):
+    """Prints the per-step latency percentiles. plan is the compiled plan of the last run, if any"""
+    summary = stats.timings.summary()
+    print(f"\n{Fore.YELLOW}⏱ Step timings (ms):{Fore.WHITE}")
+    if not any(step['count'] for step in summary.values()):
+        print("   No samples yet - start the bot first")
+        return
+    print(f"   {'step':<8} {'count':>6} {'p50':>9} {'p95':>9} {'p99':>9} {'max':>9}")
+    for name, step in summary.items():
+        if step['count']:
+            print(f"   {name:<8} {step['count']:>6} {step['p50_ms']:>9.1f} {step['p95_ms']:>9.1f} {step['p99_ms']:>9.1f} {step['max_ms']:>9.1f}")
+    if config.input_pause and plan is not None:
+        # Every move/click of the plan is followed by the backend's implicit pause
+        print(f"   Input pause adds {Fore.YELLOW}{config.input_pause}s{Fore.WHITE} to every move/click "
+              f"(~{config.input_pause * plan.inputs:.1f}s per snap)")
+
+def statistics_menu(stats, config, plan=None):
     """Displays and manages statistics"""
     clear()
     print_banner()
     print(f"{Fore.CYAN}═══ STATISTICS ═══{Fore.WHITE}\n")
     
+    snapshot = stats.snapshot()
     print(f"{Fore.YELLOW}📊 Global Statistics:{Fore.WHITE}")
-    print(f"   Total snaps sent: {Fore.GREEN}{stats.total_snaps_sent}{Fore.WHITE}")
-    print(f"   Snaps this session: {Fore.GREEN}{stats.session_snaps}{Fore.WHITE}")
-    print(f"   Errors this session: {Fore.RED}{stats.errors_count}{Fore.WHITE}")
+    print(f"   Total snaps sent: {Fore.GREEN}{snapshot['total_snaps_sent']}{Fore.WHITE}")
+    print(f"   Snaps this session: {Fore.GREEN}{snapshot['session_snaps']}{Fore.WHITE}")
+    print(f"   Errors this session: {Fore.RED}{snapshot['errors_count']}{Fore.WHITE}")
+    for kind, count in snapshot['error_kinds'].items():
+        print(f"      {ERROR_LABELS.get(kind, kind)}: {Fore.RED}{count}{Fore.WHITE}")
     
-    if stats.session_snaps > 0:
-        success_rate = (stats.session_snaps / (stats.session_snaps + stats.errors_count)) * 100
+    if snapshot['session_snaps'] > 0:
+        success_rate = (snapshot['session_snaps'] / (snapshot['session_snaps'] + snapshot['errors_count'])) * 100
         print(f"   Success rate: {Fore.GREEN}{success_rate:.1f}%{Fore.WHITE}")
     
+    if stats.scheduler and stats.scheduler.cycles:
+        print(f"   Cycles: {Fore.GREEN}{stats.scheduler.cycles}{Fore.WHITE} "
+              f"(overruns: {Fore.YELLOW}{stats.scheduler.overruns}{Fore.WHITE})")
+    
+    rolling = snapshot['rolling']
+    if rolling['cycles']:
+        print(f"\n{Fore.YELLOW}📉 Last {rolling['window_s']:.0f}s ({rolling['cycles']} cycles):{Fore.WHITE}")
+        print(f"   Throughput: {Fore.GREEN}{rolling['snaps_per_minute']:.1f}{Fore.WHITE} snaps/min")
+        print(f"   Error rate: {Fore.RED if rolling['error_rate'] else Fore.GREEN}{rolling['error_rate']:.1%}{Fore.WHITE}")
+        print(f"   Cycle time: p50 {rolling['p50_s']:.2f}s  p95 {rolling['p95_s']:.2f}s  p99 {rolling['p99_s']:.2f}s")
+    
+    if snapshot['sessions']:
+        print(f"\n{Fore.YELLOW}🗂 Recent runs:{Fore.WHITE}")
+        for session in snapshot['sessions']:
+            started = (session['started_at'] or session['id'])[:19].replace('T', ' ')
+            note = f" {Fore.YELLOW}(recovered){Fore.WHITE}" if session.get('recovered') else ""
+            print(f"   {started}  snaps: {Fore.GREEN}{session['snaps']}{Fore.WHITE}  "
+                  f"errors: {Fore.RED}{session['errors'] if session['errors'] is not None else '-'}{Fore.WHITE}{note}")
+    
+    print_step_timings(stats, config, plan)
+    
     print(f"\n[1] Reset statistics")
+    print(f"[2] Export step timings")
     print(f"[0] Return to main menu")
     
     option = input(f"\n{Fore.RED}> {Fore.WHITE}")
@@ -376,55 +205,182 @@ def statistics_menu(stats):
     if option == "1":
         confirm = input("Are you sure? (y/n): ")
         if confirm.lower() == 'y':
-            stats.total_snaps_sent = 0
-            stats.session_snaps = 0
-            stats.errors_count = 0
-            stats.save_stats()
+            stats.reset()
             nice_print("Statistics reset", "✓", Fore.GREEN)
             input("Press ENTER to continue...")
+    elif option == "2":
+        path = stats.timings.export(config.state_dir / TIMINGS_FILE)
+        nice_print(f"Step timings exported to {path}", "✓", Fore.GREEN)
+        input("Press ENTER to continue...")
+
+# ==================== BENCHMARK REPORT ====================
+def print_benchmark_report(results):
+    """Prints the benchmark results"""
+    print(f"{Fore.CYAN}═══ BENCHMARK (simulated backend) ═══{Fore.WHITE}\n")
+    print(f"{Fore.YELLOW}Per-call latency (ms):{Fore.WHITE}")
+    for name, summary in results['call_latency'].items():
+        print(f"   {name:<10} mean {summary['mean']:.4f}  p50 {summary['p50']:.4f}  p95 {summary['p95']:.4f}  p99 {summary['p99']:.4f}")
+    snap = results['send_snap']
+    print(f"\n{Fore.YELLOW}send_snap overhead beyond {snap['configured_delay_s']:.2f}s of delays (ms):{Fore.WHITE}")
+    print(f"   mean {snap['mean']:.4f}  p50 {snap['p50']:.4f}  p95 {snap['p95']:.4f}  p99 {snap['p99']:.4f}")
+    check = results['screen_check']
+    if check is None:
+        print(f"\n{Fore.YELLOW}Screen check:{Fore.WHITE} skipped, numpy is not installed")
+    else:
+        print(f"\n{Fore.YELLOW}Screen check per position (ms, synthetic screen):{Fore.WHITE}")
+        print(f"   mean {check['mean']:.4f}  p50 {check['p50']:.4f}  p95 {check['p95']:.4f}  p99 {check['p99']:.4f}")
+        print(f"   Tinted buttons accepted: {check['tint_accepted']}, shifted window detected: {check['shift_detected']}")
+    grabs = results['screen_grab']
+    if grabs is None:
+        print(f"\n{Fore.YELLOW}Screen grab:{Fore.WHITE} skipped, no display")
+    else:
+        print(f"\n{Fore.YELLOW}Screen grab per position (ms, real screen):{Fore.WHITE}")
+        for name, grab in grabs.items():
+            print(f"   {name:<10} mean {grab['mean']:.4f}  p50 {grab['p50']:.4f}  p95 {grab['p95']:.4f}  p99 {grab['p99']:.4f}")
+    run = results['run_bot']
+    print(f"\n{Fore.YELLOW}run_bot loop ({run['cycles']} cycles):{Fore.WHITE}")
+    print(f"   Overhead per cycle: {run['overhead_ms_per_cycle']:.3f} ms")
+    print(f"   Cycle period (virtual clock): {run['period_s']:.3f} s, overruns: {run['overruns']}")
+    print(f"   Throughput (virtual clock): {run['snaps_per_minute_virtual']:.3f} snaps/min")
+    print(f"   Rolling metrics: {format_rolling(run['rolling'])}")
+    recovery = results['failure_recovery']
+    print(f"   Recovery from {recovery['errors']} input errors: {recovery['lost_s']:.2f} s lost "
+          f"(one cycle is {recovery['period_s']:.2f} s), breaker {recovery['breaker']}")
+    print(f"\n{Fore.YELLOW}run_bot step timings (ms):{Fore.WHITE}")
+    for name, step in run['steps'].items():
+        if step['count']:
+            print(f"   {name:<10} p50 {step['p50_ms']:.4f}  p95 {step['p95_ms']:.4f}  p99 {step['p99_ms']:.4f}  max {step['max_ms']:.4f}")
 
-# ==================== VERSION CHECK ====================
-def check_version():
-    """Checks for new versions available"""
+# ==================== RUN COMMAND ====================
+def run_command(args, state_dir, scratch=False):
+    """Runs the bot without the menu and prints a JSON summary of the run.
+
+    Messages go to stderr so stdout only carries the JSON. The exit code is
+    0 after a clean run, 1 if the bot crashed and 2 if it could not start.
+    scratch marks a state_dir that is deleted after the run.
+    """
+    def notify(text, status="-", color=Fore.WHITE):
+        print(format_status(text, status, color), file=sys.stderr)
+
+    def fail(message):
+        print(json.dumps({'version': VERSION, 'error': message}, indent=4))
+        return 2
+
+    if not args.simulate:
+        missing = missing_modules(('pyautogui', 'keyboard'))
+        if missing:
+            return fail(f"Missing required modules: {', '.join(missing)}")
+    
+    config = Config(state_dir, notify=notify)
+    stats = Statistics(state_dir, notify=notify)
     try:
-        r = requests.get("https://raw.githubusercontent.com/useragents/Snapchat-Snapscore-Botter/refs/heads/main/version.txt", timeout=3)
-        latest_version = r.text.strip()
-        if latest_version != VERSION:
-            nice_print(f"New version available: {latest_version}", "!", Fore.YELLOW)
-            nice_print(f"Your version: {VERSION}", "!", Fore.YELLOW)
-            input("Press ENTER to continue...")
-    except:
-        pass
+        if args.cycles is not None:
+            config.apply({'auto_stop_enabled': True, 'auto_stop_after': args.cycles})
+        bot = AdvancedSnapBot(config, stats, backend=SimulatedBackend(record=False) if args.simulate else None,
+                              hotkeys=HotkeyManager(use_keyboard=not args.simulate))
+        bot.notify = bot.hotkeys.notify = notify
+        bot.load_action_plan()
+        if not bot.load_positions():
+            if not args.simulate:
+                return fail("No saved positions - capture them once from the menu")
+            bot.positions = dict(BENCH_POSITIONS)
+        if config.verify_screen and not args.simulate:
+            bot.load_verifier()
+        bot.compile_plan()
+    except (ConfigError, PlanError) as e:
+        return fail(str(e))
+    
+    controller = BotController(bot)
+    controller.start(args.people)
+    try:
+        # Short waits keep Ctrl+C responsive
+        while not controller.wait(0.5):
+            pass
+    except KeyboardInterrupt:
+        controller.stop()
+    
+    summary = controller.summary()
+    summary['backend'] = 'simulated' if args.simulate else 'pyautogui'
+    summary['state_dir'] = None if scratch else str(state_dir.resolve())
+    print(json.dumps(summary, indent=4))
+    return 1 if controller.error else 0
+
+def run_scratch(args):
+    """Runs a simulated run on a scratch copy of the settings, actions and positions.
+
+    Simulated snaps are not real, so they must not reach the statistics of
+    the state directory they were run from.
+    """
+    with tempfile.TemporaryDirectory() as scratch:
+        scratch = Path(scratch)
+        for name in (CONFIG_FILE, ACTIONS_FILE, POSITIONS_FILE):
+            if (args.state_dir / name).exists():
+                shutil.copy2(args.state_dir / name, scratch / name)
+        return run_command(args, scratch, scratch=True)
 
 # ==================== MAIN FUNCTION ====================
-def main():
+def shutdown(controller, stats, timeout=5.0):
+    """Stops a running bot within timeout seconds and saves the statistics"""
+    if controller.running:
+        nice_print("Stopping bot...", "!", Fore.YELLOW)
+        if not controller.stop(timeout):
+            nice_print(f"Bot did not stop within {timeout:.0f}s, saving anyway", "✗", Fore.RED)
+    stats.save_stats()
+
+def main(state_dir, trace_startup=False):
     """Main program entry point"""
-    check_version()
+    version_checker = VersionChecker(state_dir / VERSION_CACHE_FILE)
+    version_checker.start()
     
-    config = Config()
-    stats = Statistics()
+    config = Config(state_dir)
+    stats = Statistics(state_dir)
     bot = AdvancedSnapBot(config, stats)
+    controller = BotController(bot)
+    dashboard = None
+    mark_startup("init")
     
     while True:
         clear()
         print_banner()
         
+        if version_checker.update_available():
+            nice_print(f"New version available: {version_checker.latest} (yours: {VERSION})", "!", Fore.YELLOW)
+            print()
+        
+        if controller.running:
+            status = controller.status()
+            nice_print(f"Bot {status['state']}: {status['session_snaps']} snaps sent this session, "
+                       f"{status['elapsed']} elapsed. Press 'P' to pause, 'Q' to stop", "▶", Fore.GREEN)
+            print()
+        
         print(f"{Fore.CYAN}═══ SNAP SCORE BOT MAIN MENU ═══{Fore.WHITE}\n")
-        print(f"[{Fore.RED}1{Fore.WHITE}] Start Bot")
+        print(f"[{Fore.RED}1{Fore.WHITE}] {'Bot Dashboard' if controller.running else 'Start Bot'}")
         print(f"[{Fore.RED}2{Fore.WHITE}] Configuration")
         print(f"[{Fore.RED}3{Fore.WHITE}] Statistics")
         print(f"[{Fore.RED}4{Fore.WHITE}] Help & Instructions")
         print(f"[{Fore.RED}5{Fore.WHITE}] Disclaimer")
         print(f"[{Fore.RED}0{Fore.WHITE}] Exit")
         
+        if trace_startup:
+            mark_startup("menu")
+            print_startup_trace()
+            trace_startup = False
+        
         try:
             option = input(f"\n{Fore.RED}> {Fore.WHITE}")
             
-            if option == "1":
+            if option == "1" and controller.running:
+                show_dashboard(dashboard)
+                
+            elif option == "1":
                 try:
                     shortcut_user_count = int(input(f"\nHow many people are in your shortcut? {Fore.RED}> {Fore.WHITE}"))
                     
-                    if not bot.positions:
+                    # The last run may have stopped while the menu was shown, leaving
+                    # messages on its dashboard: the prompts below must reach the console
+                    bot.notify = bot.hotkeys.notify = nice_print
+                    plan = bot.load_action_plan()
+                    if any(name not in bot.positions for name in plan.positions):
                         load_saved = input("\nLoad saved positions? (y/n): ")
                         if load_saved.lower() == 'y' and bot.load_positions():
                             nice_print("Positions loaded", "✓", Fore.GREEN)
@@ -436,17 +392,21 @@ def main():
                                 input("Press ENTER to continue...")
                                 continue
                     
+                    if config.verify_screen and bot.verifier is None:
+                        bot.load_verifier()
+                    bot.compile_plan()
                     print("\n")
                     nice_print("Positions ready. Press F when you're ready to start", "!", Fore.CYAN)
-                    while not keyboard.is_pressed("f"):
-                        time.sleep(0.1)
-                    
-                    clear()
-                    print_banner()
-                    bot.run_bot(shortcut_user_count)
+                    bot.hotkeys.wait_for_key("f")
                     
-                    input("\nPress ENTER to return to the menu...")
+                    dashboard = Dashboard(bot, controller)
+                    bot.notify = bot.hotkeys.notify = dashboard.notify
+                    controller.start(shortcut_user_count)
+                    show_dashboard(dashboard)
                     
+                except PlanError as e:
+                    nice_print(f"Invalid action plan: {e}", "✗", Fore.RED)
+                    input("Press ENTER to continue...")
                 except ValueError:
                     nice_print("Invalid number", "✗", Fore.RED)
                     input("Press ENTER to continue...")
@@ -455,7 +415,7 @@ def main():
                 configuration_menu(config)
                 
             elif option == "3":
-                statistics_menu(stats)
+                statistics_menu(stats, config, bot.plan)
                 
             elif option == "4":
                 clear()
@@ -472,6 +432,7 @@ def main():
                 print(f"\n{Fore.YELLOW}Bot Controls:{Fore.WHITE}")
                 print("   Q - Stop the bot")
                 print("   P - Pause/Resume")
+                print("   ENTER - Back to the menu (the bot keeps running)")
                 print(f"\n{Fore.YELLOW}Video Tutorial:{Fore.WHITE} {TUTORIAL_VIDEO}")
                 input("\nPress ENTER to return to the menu...")
                 
@@ -490,20 +451,58 @@ def main():
                 
             elif option == "0":
                 nice_print("Exiting...", "!", Fore.YELLOW)
-                stats.save_stats()
+                shutdown(controller, stats)
                 sys.exit(0)
                 
         except KeyboardInterrupt:
             nice_print("\nExiting...", "!", Fore.YELLOW)
+            shutdown(controller, stats)
             sys.exit(0)
         except Exception as e:
             nice_print(f"Unexpected error: {e}", "✗", Fore.RED)
             input("Press ENTER to continue...")
 
 # ==================== PROGRAM ENTRY ====================
+def parse_args(argv):
+    """The interactive menu by default, the run subcommand, or the benchmarks"""
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--state-dir', type=Path, default=argparse.SUPPRESS,
+                        help="directory for config.json, stats.json, positions.json and the other "
+                             "state files (default: the current directory)")
+    parser = argparse.ArgumentParser(description=f"SnapScoreBot v{VERSION} - {CREDITS}", parents=[common])
+    parser.add_argument('--trace-startup', action='store_true', help="print how long each startup phase took")
+    parser.add_argument('--benchmark', nargs='?', const=200, type=int, metavar='CYCLES',
+                        help="run the headless benchmarks and exit")
+    commands = parser.add_subparsers(dest='command')
+    run = commands.add_parser('run', parents=[common], help="run the bot without the menu and print a JSON summary")
+    run.add_argument('--people', type=int, default=1, help="people in the shortcut (default: 1)")
+    run.add_argument('--cycles', type=int, help="stop after this many snaps (default: the auto-stop setting)")
+    run.add_argument('--simulate', action='store_true', help="use the simulated backend instead of the real mouse")
+    args = parser.parse_args(argv)
+    # Without --state-dir, a simulated run works on a scratch copy of the current directory
+    args.scratch = args.command == 'run' and args.simulate and not hasattr(args, 'state_dir')
+    args.state_dir = getattr(args, 'state_dir', Path.cwd())
+    return args
+
 if __name__ == "__main__":
+    args = parse_args(sys.argv[1:])
+    
+    # Initialize colorama. Conversion is only forced on Windows: elsewhere there is
+    # no Win32 console to translate cursor-positioning codes to
+    init(autoreset=True, convert=True if sys.platform.startswith('win') else None)
+    
+    if args.benchmark is not None:
+        print_benchmark_report(run_benchmarks(args.benchmark))
+        sys.exit(0)
+    
+    args.state_dir.mkdir(parents=True, exist_ok=True)
+    if args.command == 'run':
+        sys.exit(run_scratch(args) if args.scratch else run_command(args, args.state_dir))
+
+    check_modules()
+    mark_startup("imports")
     try:
-        main()
+        main(args.state_dir, trace_startup=args.trace_startup)
     except KeyboardInterrupt:
         print("\n")
         nice_print("Program interrupted by user", "!", Fore.YELLOW)
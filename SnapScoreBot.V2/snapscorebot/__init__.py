@@ -0,0 +1,22 @@
+"""SnapScoreBot engine.
+
+Importing the package has no side effects: it does not initialise
+colorama, touch the terminal or read any file. pyautogui, keyboard,
+requests and numpy are only imported when a feature needs them. All
+state files are read from and written to an explicit state directory
+passed to Config and Statistics.
+"""
+
+from .settings import VERSION
+from .backends import Point, BackendError, FailSafeError, InputBackend, PyAutoGUIBackend, SimulatedBackend
+from .bot import AdvancedSnapBot, BotController
+from .config import Config, ConfigError
+from .console import nice_print, format_status, format_rolling
+from .dashboard import Dashboard
+from .failures import ERROR_LABELS, FailureHandler, classify_error
+from .hotkeys import HotkeyManager
+from .plan import ActionPlan, PlanError, MissingPositionError
+from .screen import ScreenVerifier, ScreenMismatchError, numpy_available
+from .stats import Statistics
+from .timing import StepTimer, CycleMetrics, CycleScheduler
+from .version import VersionChecker
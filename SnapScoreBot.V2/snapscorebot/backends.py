@@ -0,0 +1,189 @@
+"""Input backends: the real mouse through pyautogui, and a simulated one"""
+
+import time
+import threading
+import importlib.util
+from collections import deque, namedtuple
+
+# ==================== INPUT BACKENDS ====================
+Point = namedtuple('Point', 'x y')
+
+class BackendError(Exception):
+    """Raised by a backend when a move or click could not be performed"""
+
+class FailSafeError(BackendError):
+    """Raised when the fail-safe is triggered (mouse moved to a screen corner)"""
+
+class InputBackend:
+    """Interface the bot uses to drive the mouse and wait between steps.
+
+    The backend also owns the clock, so a simulated backend can skip the
+    configured delays and the same cycle code runs without a display.
+    grabs_regions is False when grab() has to capture the whole screen.
+    """
+
+    grabs_regions = True
+
+    def position(self):
+        """Returns the current mouse position as a Point"""
+        raise NotImplementedError
+
+    def move_to(self, point):
+        """Moves the mouse to the given point"""
+        raise NotImplementedError
+
+    def click(self):
+        """Clicks at the current mouse position"""
+        raise NotImplementedError
+
+    def grab(self, region):
+        """Returns the pixels of a (left, top, width, height) region as an RGB array or image"""
+        raise NotImplementedError
+
+    def release(self):
+        """Frees what grab() opened on the calling thread"""
+
+    def set_pause(self, seconds):
+        """Sets the implicit delay applied after every move/click"""
+        self.pause = seconds
+
+    def monotonic(self):
+        """Returns the backend's monotonic clock in seconds"""
+        return time.monotonic()
+
+    def sleep(self, seconds, hotkeys):
+        """Waits between steps. Returns False if the session was stopped"""
+        return hotkeys.sleep(seconds)
+
+class PyAutoGUIBackend(InputBackend):
+    """Drives the real mouse through pyautogui.
+
+    pyautogui sleeps for PAUSE seconds after every call; it is set from
+    the input_pause option so that cost is explicit instead of hidden.
+
+    pyautogui.screenshot(region=...) captures the whole screen and crops
+    it, and may start a screenshot tool to do so. When mss is installed,
+    grab() copies only the region instead.
+
+    Errors of pyautogui, the screenshot libraries and the OS are raised
+    as BackendError, so the bot can tell them from bugs.
+    """
+
+    def __init__(self, pause=0.1):
+        import pyautogui
+        self.pyautogui = pyautogui
+        errors = [pyautogui.PyAutoGUIException, OSError]
+        if hasattr(pyautogui, 'pyscreeze'):
+            errors.append(pyautogui.pyscreeze.PyScreezeException)
+        self.grabs_regions = importlib.util.find_spec('mss') is not None
+        if self.grabs_regions:
+            import mss
+            self.mss = mss
+            errors.append(mss.exception.ScreenShotError)
+        self.errors = tuple(errors)
+        self._grabbers = threading.local()
+        self.set_pause(pause)
+
+    def set_pause(self, seconds):
+        self.pause = seconds
+        self.pyautogui.PAUSE = seconds
+
+    def position(self):
+        try:
+            return Point(*self.pyautogui.position())
+        except self.errors as e:
+            raise BackendError(str(e)) from e
+
+    def move_to(self, point):
+        try:
+            self.pyautogui.moveTo(point.x, point.y)
+        except self.pyautogui.FailSafeException as e:
+            raise FailSafeError(str(e)) from e
+        except self.errors as e:
+            raise BackendError(str(e)) from e
+
+    def click(self):
+        try:
+            self.pyautogui.click()
+        except self.pyautogui.FailSafeException as e:
+            raise FailSafeError(str(e)) from e
+        except self.errors as e:
+            raise BackendError(str(e)) from e
+
+    def grab(self, region):
+        try:
+            if not self.grabs_regions:
+                return self.pyautogui.screenshot(region=region)
+            # An mss instance may only be used on the thread that opened it
+            grabber = getattr(self._grabbers, 'mss', None)
+            if grabber is None:
+                grabber = self._grabbers.mss = getattr(self.mss, 'MSS', self.mss.mss)()
+            left, top, width, height = region
+            shot = grabber.grab({'left': left, 'top': top, 'width': width, 'height': height})
+        except self.errors as e:
+            raise BackendError(f"Could not capture the screen: {e}") from e
+        from PIL import Image
+        return Image.frombytes('RGB', shot.size, shot.rgb)
+
+    def release(self):
+        grabber = getattr(self._grabbers, 'mss', None)
+        if grabber is not None:
+            grabber.close()
+            self._grabbers.mss = None
+
+class SimulatedBackend(InputBackend):
+    """In-memory backend that records calls and runs on a virtual clock.
+
+    Sleeps do not block: they only advance the clock, so time spent in a
+    run is pure cycle overhead while throughput can still be measured
+    against the configured delays. pause models pyautogui's implicit
+    delay after each move/click on the virtual clock. Errors queued with
+    fail_next() are raised by the next moves/clicks. screen is an optional
+    height x width x 3 array that grab() reads from.
+    """
+
+    def __init__(self, record=True, pause=0.0, screen=None):
+        self.record = record
+        self.pause = pause
+        self.calls = []
+        self.cursor = Point(0, 0)
+        self.clicks = 0
+        self.slept = 0.0
+        self.faults = deque()
+        self.screen = screen
+
+    def fail_next(self, *errors):
+        """Queues errors to raise from the next move/click calls, one per call"""
+        self.faults.extend(errors)
+
+    def position(self):
+        return self.cursor
+
+    def move_to(self, point):
+        if self.faults:
+            raise self.faults.popleft()
+        self.cursor = Point(point.x, point.y)
+        self.slept += self.pause
+        if self.record:
+            self.calls.append(('move', self.cursor))
+
+    def click(self):
+        if self.faults:
+            raise self.faults.popleft()
+        self.clicks += 1
+        self.slept += self.pause
+        if self.record:
+            self.calls.append(('click', self.cursor))
+
+    def grab(self, region):
+        if self.screen is None:
+            raise BackendError("The simulated backend has no screen")
+        left, top, width, height = region
+        return self.screen[top:top + height, left:left + width]
+
+    def monotonic(self):
+        return time.perf_counter() + self.slept
+
+    def sleep(self, seconds, hotkeys):
+        self.slept += seconds
+        return not hotkeys.stopped
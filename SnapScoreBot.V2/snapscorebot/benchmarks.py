@@ -0,0 +1,192 @@
+"""Headless benchmarks of the snap cycle on the simulated backend"""
+
+import os
+import time
+import tempfile
+import importlib.util
+
+from .backends import Point, BackendError, PyAutoGUIBackend, SimulatedBackend
+from .bot import AdvancedSnapBot, BotController
+from .config import Config
+from .hotkeys import HotkeyManager
+from .screen import ScreenVerifier, numpy_available
+from .settings import TEMPLATES_FILE
+from .stats import Statistics
+from .timing import percentile
+
+# ==================== BENCHMARKS ====================
+BENCH_POSITIONS = {
+    'camera': Point(640, 620),
+    'send_to': Point(1180, 680),
+    'shortcut': Point(420, 180),
+    'select_all': Point(900, 180)
+}
+
+def _quiet(text, status="-", color=None):
+    """notify callback that drops messages"""
+
+def _summary_ms(samples):
+    """Mean and p50/p95/p99 of samples given in seconds, in milliseconds"""
+    ordered = sorted(samples)
+    return {
+        'mean': sum(ordered) / len(ordered) * 1000 if ordered else 0.0,
+        'p50': percentile(ordered, 50) * 1000,
+        'p95': percentile(ordered, 95) * 1000,
+        'p99': percentile(ordered, 99) * 1000
+    }
+
+def _bench_bot(state_dir):
+    """Builds a quiet bot on the simulated backend with fixed positions"""
+    bot = AdvancedSnapBot(Config(state_dir, notify=_quiet), Statistics(state_dir, notify=_quiet),
+                          backend=SimulatedBackend(record=False), hotkeys=HotkeyManager(use_keyboard=False))
+    bot.notify = bot.hotkeys.notify = _quiet
+    bot.positions = dict(BENCH_POSITIONS)
+    return bot
+
+def bench_call_latency(state_dir, calls=20000):
+    """Per-call latency of the primitives a cycle is built from"""
+    bot = _bench_bot(state_dir)
+    point = BENCH_POSITIONS['camera']
+    primitives = {
+        'move_to': lambda: bot.backend.move_to(point),
+        'click': bot.backend.click,
+        'wait': lambda: bot.wait(0),
+        'get_delay': bot.get_delay
+    }
+    results = {}
+    for name, call in primitives.items():
+        samples = []
+        for _ in range(calls):
+            start = time.perf_counter()
+            call()
+            samples.append(time.perf_counter() - start)
+        results[name] = _summary_ms(samples)
+    return results
+
+def bench_send_snap(state_dir, cycles=2000):
+    """Real time spent in send_snap beyond its configured delays"""
+    bot = _bench_bot(state_dir)
+    samples = []
+    for _ in range(cycles):
+        start = time.perf_counter()
+        bot.send_snap(1)
+        samples.append(time.perf_counter() - start)
+    result = _summary_ms(samples)
+    result['configured_delay_s'] = bot.backend.slept / cycles
+    return result
+
+def bench_run_bot(state_dir, cycles=200):
+    """Full run_bot loop against the virtual clock, persistence included"""
+    bot = _bench_bot(state_dir)
+    bot.config.apply({'auto_stop_enabled': True, 'auto_stop_after': cycles})
+    virtual_start = bot.backend.monotonic()
+    start = time.perf_counter()
+    controller = BotController(bot)
+    controller.start(1)
+    controller.wait()
+    wall = time.perf_counter() - start
+    virtual = bot.backend.monotonic() - virtual_start
+    return {
+        'cycles': bot.stats.session_snaps,
+        'overhead_ms_per_cycle': wall / cycles * 1000,
+        'period_s': virtual / cycles,
+        'overruns': bot.stats.scheduler.overruns,
+        'snaps_per_minute_virtual': bot.stats.session_snaps / virtual * 60 if virtual else 0.0,
+        'rolling': bot.stats.metrics.rollup(),
+        'steps': bot.stats.timings.summary()
+    }
+
+def bench_failure_recovery(state_dir, cycles=50, burst=3):
+    """Virtual time lost to a burst of transient input errors, compared with a clean run"""
+    def run(faults):
+        bot = _bench_bot(state_dir)
+        bot.config.apply({'auto_stop_enabled': True, 'auto_stop_after': cycles})
+        bot.backend.fail_next(*faults)
+        virtual_start = bot.backend.monotonic()
+        controller = BotController(bot)
+        controller.start(1)
+        controller.wait()
+        return bot.backend.monotonic() - virtual_start, bot
+    clean, _ = run([])
+    faulty, bot = run([BackendError("simulated input error")] * burst)
+    return {
+        'errors': bot.stats.errors_count,
+        'lost_s': faulty - clean,
+        'period_s': clean / cycles,
+        'breaker': bot.failures.state
+    }
+
+def bench_screen_check(state_dir, calls=2000):
+    """Cost and accuracy of ScreenVerifier on a synthetic screen"""
+    if not numpy_available():
+        return None
+    import numpy
+    rng = numpy.random.default_rng(0)
+    screen = rng.integers(0, 256, size=(1080, 1920, 3), dtype=numpy.uint8)
+    backend = SimulatedBackend(record=False, screen=screen)
+    verifier = ScreenVerifier(os.path.join(state_dir, TEMPLATES_FILE), notify=_quiet)
+    for name, point in BENCH_POSITIONS.items():
+        verifier.capture(backend, name, point)
+    names = list(BENCH_POSITIONS)
+    samples = []
+    for i in range(calls):
+        start = time.perf_counter()
+        verifier.check(backend, (names[i % len(names)],))
+        samples.append(time.perf_counter() - start)
+    result = _summary_ms(samples)
+    # A hovered button is tinted, a moved window shifts everything
+    backend.screen = numpy.clip(screen.astype(numpy.int16) + 25, 0, 255).astype(numpy.uint8)
+    result['tint_accepted'] = not verifier.check(backend, names)
+    backend.screen = numpy.roll(screen, (40, 60), axis=(0, 1))
+    result['shift_detected'] = len(verifier.check(backend, names)) == len(names)
+    return result
+
+def bench_screen_grab(state_dir, calls=100):
+    """Cost of grabbing one verification patch from the real screen, with mss and with pyautogui.
+
+    The only case that needs a display: returns None without one.
+    """
+    if importlib.util.find_spec('pyautogui') is None:
+        return None
+    try:
+        backend = PyAutoGUIBackend(0)
+    except Exception:
+        return None  # pyautogui cannot be imported without a display
+    size = 2 * ScreenVerifier.RADIUS + 1
+    region = (100, 100, size, size)
+    grabbers = {'mss': True, 'pyautogui': False} if backend.grabs_regions else {'pyautogui': False}
+    results = {}
+    for name, grabs_regions in grabbers.items():
+        backend.grabs_regions = grabs_regions
+        samples = []
+        try:
+            for _ in range(calls):
+                start = time.perf_counter()
+                backend.grab(region)
+                samples.append(time.perf_counter() - start)
+        except Exception:
+            continue
+        finally:
+            backend.release()
+        results[name] = _summary_ms(samples)
+    return results or None
+
+def run_benchmarks(cycles=200):
+    """Runs the benchmark suite headless and returns the results.
+
+    Every case gets its own scratch state directory, so benchmarks never
+    touch real state files.
+    """
+    cases = {
+        'call_latency': bench_call_latency,
+        'send_snap': lambda state_dir: bench_send_snap(state_dir, cycles * 10),
+        'run_bot': lambda state_dir: bench_run_bot(state_dir, cycles),
+        'failure_recovery': bench_failure_recovery,
+        'screen_check': bench_screen_check,
+        'screen_grab': bench_screen_grab
+    }
+    results = {}
+    for name, case in cases.items():
+        with tempfile.TemporaryDirectory() as state_dir:
+            results[name] = case(state_dir)
+    return results
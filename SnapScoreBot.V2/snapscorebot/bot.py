@@ -0,0 +1,434 @@
+"""The snap bot and the controller that runs it in the background"""
+
+import time
+import json
+import threading
+
+from colorama import Fore
+
+from .backends import Point, PyAutoGUIBackend
+from .config import ConfigError
+from .console import nice_print
+from .failures import ERROR_LABELS, FailureHandler, classify_error
+from .hotkeys import HotkeyManager
+from .plan import ActionPlan, OP_MOVE, OP_CLICK, OP_VERIFY
+from .screen import ScreenMismatchError, ScreenVerifier, numpy_available
+from .settings import (VERSION, CONFIG_FILE, POSITIONS_FILE, ACTIONS_FILE, TEMPLATES_FILE, PROFILE_FILE,
+                        MIN_CYCLE_GAP)
+from .timing import CycleScheduler
+
+# ==================== SNAP BOT CORE ====================
+class AdvancedSnapBot:
+    """The snap cycle: positions, the compiled action plan and the run loop.
+
+    Positions, actions.json and the screen templates are kept in the
+    config's state_dir. Messages go through notify.
+    """
+
+    def __init__(self, config, stats, backend=None, hotkeys=None):
+        self.config = config
+        self.stats = stats
+        self.state_dir = config.state_dir
+        self.positions_file = self.state_dir / POSITIONS_FILE
+        self.actions_file = self.state_dir / ACTIONS_FILE
+        self.templates_file = self.state_dir / TEMPLATES_FILE
+        self._backend = backend
+        self.hotkeys = hotkeys if hotkeys is not None else HotkeyManager()
+        self.positions = {}
+        self.action_plan = None
+        self.plan = None
+        self.verifier = None
+        self.is_running = False
+        self.first_try = True
+        self.cycle_delay = 0.0
+        self._config_version = None
+        self.last_error = None
+        self.failures = FailureHandler()
+        self.notify = nice_print
+    
+    @property
+    def backend(self):
+        """Input backend, defaulting to pyautogui which is only imported when first needed"""
+        if self._backend is None:
+            self._backend = PyAutoGUIBackend(self.config.input_pause)
+        return self._backend
+        
+    def load_action_plan(self):
+        """Loads actions.json and drops the compiled plan"""
+        self.action_plan = ActionPlan.load(self.actions_file)
+        self.plan = None
+        return self.action_plan
+    
+    def compile_plan(self):
+        """Compiles the action plan against the current positions"""
+        if self.action_plan is None:
+            self.load_action_plan()
+        verified = self.verifier.patches if self.verifier is not None and self.config.verify_screen else ()
+        self.plan = self.action_plan.compile(self.positions, self.config.click_sampler, verified)
+        return self.plan
+    
+    def new_verifier(self):
+        """A ScreenVerifier if screen verification is enabled and numpy is installed"""
+        if not self.config.verify_screen:
+            return None
+        if not numpy_available():
+            self.notify("numpy is not installed - positions will not be verified on screen", "!", Fore.YELLOW)
+            return None
+        if not self.backend.grabs_regions:
+            self.notify("mss is not installed - every check takes a full screenshot, install mss to make it fast",
+                        "!", Fore.YELLOW)
+        return ScreenVerifier(self.templates_file, self.notify)
+    
+    def get_positions(self):
+        """Captures the mouse positions the action plan needs, and their screen templates"""
+        if self.action_plan is None:
+            self.load_action_plan()
+        verifier = self.new_verifier()
+        
+        try:
+            for key, description in self.action_plan.positions.items():
+                self.notify(f"Move the mouse to the {description} and press F", "→", Fore.YELLOW)
+                
+                if self.hotkeys.wait_for_key("f", "escape") != "f":
+                    return False
+                self.positions[key] = self.backend.position()
+                if verifier is not None:
+                    try:
+                        verifier.capture(self.backend, key, self.positions[key])
+                    except Exception as e:
+                        self.notify(f"Could not capture the screen, positions will not be verified: {e}", "!", Fore.YELLOW)
+                        verifier = None
+                self.notify(f"Position saved: {self.positions[key]}", "✓", Fore.GREEN)
+                time.sleep(self.config.position_delay)
+        finally:
+            self.backend.release()
+        
+        self.plan = None
+        self.verifier = verifier
+        self.save_positions()
+        if verifier is not None:
+            verifier.save()
+        return True
+    
+    def save_positions(self):
+        """Saves positions to a JSON file"""
+        positions_data = {k: {'x': v.x, 'y': v.y} for k, v in self.positions.items()}
+        with open(self.positions_file, 'w') as f:
+            json.dump(positions_data, f)
+        self.notify("Positions saved to file", "✓", Fore.GREEN)
+    
+    def load_positions(self):
+        """Loads previously saved positions"""
+        if self.positions_file.exists():
+            try:
+                with open(self.positions_file, 'r') as f:
+                    data = json.load(f)
+                    for key, coords in data.items():
+                        self.positions[key] = Point(coords['x'], coords['y'])
+                self.plan = None
+                self.notify("Positions loaded from file", "✓", Fore.GREEN)
+                return True
+            except:
+                pass
+        return False
+    
+    def load_verifier(self):
+        """Loads the screen templates saved with the current positions"""
+        verifier = self.new_verifier()
+        if verifier is not None and not (verifier.load() and verifier.matches(self.positions)):
+            self.notify("No screen templates for these positions - capture new positions to verify them", "!", Fore.YELLOW)
+            verifier = None
+        self.verifier = verifier
+        self.plan = None
+    
+    def send_snap(self, shortcut_user_count):
+        """Runs the compiled action plan once. Returns False on error or when stopped mid-sequence.
+
+        After an error, last_error holds its class and the exception.
+        """
+        self.last_error = None
+        try:
+            plan = self.plan if self.plan is not None else self.compile_plan()
+            steps = plan.first if self.first_try else plan.steady
+            backend, hotkeys, verifier = self.backend, self.hotkeys, self.verifier
+            perf_counter = time.perf_counter
+            # Step timings are collected locally and recorded once per cycle
+            samples = []
+            record = samples.append
+            try:
+                for op, arg in steps:
+                    start = perf_counter()
+                    if op == OP_MOVE:
+                        backend.move_to(arg)
+                        record(('move', perf_counter() - start))
+                    elif op == OP_CLICK:
+                        backend.click()
+                        record(('click', perf_counter() - start))
+                    elif op == OP_VERIFY:
+                        mismatched = verifier.check(backend, (arg,))
+                        record(('verify', perf_counter() - start))
+                        if mismatched:
+                            raise ScreenMismatchError(f"the {arg} button is not at its saved position")
+                    else:
+                        delay = arg()
+                        self.cycle_delay += delay
+                        completed = backend.sleep(delay, hotkeys)
+                        record(('sleep', perf_counter() - start))
+                        if not completed:
+                            return False
+            finally:
+                self.stats.timings.add_many(samples)
+            # Only a completed sequence counts, so a failed or stopped first
+            # cycle runs the first_cycle_only steps again
+            self.first_try = False
+
+            self.stats.record_cycle(True, shortcut_user_count)
+            return True
+            
+        except Exception as e:
+            kind = classify_error(e)
+            self.last_error = (kind, e)
+            self.stats.record_cycle(False, error=kind)
+            return False
+    
+    def active_clock(self):
+        """Backend clock minus time spent paused"""
+        return self.backend.monotonic() - self.hotkeys.paused_seconds()
+    
+    def wait(self, seconds):
+        """Interruptible, timed delay on the backend's clock"""
+        start = time.perf_counter()
+        result = self.backend.sleep(seconds, self.hotkeys)
+        self.stats.timings.add('sleep', time.perf_counter() - start)
+        return result
+    
+    def get_delay(self):
+        """Returns a random or fixed delay"""
+        return self.config.click_sampler()
+    
+    def run_bot(self, shortcut_user_count, reset=True):
+        """Runs the main bot loop on the calling thread, under cProfile when profile_enabled is set.
+
+        reset clears the stop and pause state left by a previous run. Use
+        BotController to run it in the background.
+        """
+        if reset:
+            self.hotkeys.reset()
+        if not self.config.profile_enabled:
+            self._run_session(shortcut_user_count)
+            return
+        
+        import cProfile
+        profiler = cProfile.Profile()
+        try:
+            profiler.runcall(self._run_session, shortcut_user_count)
+        finally:
+            profile_file = self.state_dir / PROFILE_FILE
+            profiler.dump_stats(str(profile_file))
+            self.notify(f"Profile written to {profile_file}", "✓", Fore.GREEN)
+    
+    def _run_session(self, shortcut_user_count):
+        """Binds the hotkeys, runs the loop and saves the statistics"""
+        self.is_running = True
+        self._config_version = self.config.version
+        self.backend.set_pause(self.config.input_pause)
+        self.stats.scheduler = CycleScheduler(self.active_clock)
+        
+        self.hotkeys.bind_controls()
+        self.stats.start_session()
+        self.notify("Bot started. Press 'Q' to stop, 'P' to pause", "!", Fore.CYAN)
+        try:
+            self._run_loop(shortcut_user_count)
+        finally:
+            self.stats.scheduler.finish()
+            self.backend.release()
+            self.hotkeys.unbind_controls()
+            self.is_running = False
+            with self.stats.timings.measure('persist'):
+                self.stats.end_session()
+        self.notify("Bot stopped", "✓", Fore.GREEN)
+
+    def _run_loop(self, shortcut_user_count):
+        """Cycles on the scheduler until stopped by hotkey, auto-stop or the failure handler"""
+        scheduler = self.stats.scheduler
+        metrics = self.stats.metrics
+        failures = self.failures
+        failures.reset()
+        scheduler.start()
+        metrics.reset(scheduler.started_at)
+        while self.is_running:
+            if not self.hotkeys.wait_while_paused():
+                break
+            failures.on_resume()
+            self._reload_config()
+            
+            self.stats.timings.add('jitter', scheduler.begin_cycle())
+            self.cycle_delay = 0.0
+            
+            cycle_start = scheduler.clock()
+            success = self.send_snap(shortcut_user_count)
+            if not success and self.last_error is None:
+                break  # stopped in the middle of the sequence
+            cycle_end = scheduler.clock()
+            scheduler.end_cycle(success)
+            metrics.record(cycle_end, cycle_end - cycle_start, success)
+            
+            if not success:
+                if not self._handle_failure(scheduler):
+                    break
+                continue
+            
+            failures.on_success()
+            if self.config.auto_stop_enabled and scheduler.successes >= self.config.auto_stop_after:
+                self.notify(f"Auto-stop reached ({self.config.auto_stop_after} snaps)", "!", Fore.YELLOW)
+                break
+            
+            loop_delay = self.config.loop_sampler()
+            # The period is the delays this cycle was configured to take, so
+            # move/click/render time is absorbed instead of adding to it.
+            # MIN_CYCLE_GAP still separates the last click from the next cycle
+            if not scheduler.wait_next(self.cycle_delay + loop_delay, self.wait, MIN_CYCLE_GAP):
+                break
+
+    def _reload_config(self):
+        """Applies settings changed since the last cycle, in config.json or from the menu"""
+        try:
+            if self.config.reload_if_changed() and self.config.ignored:
+                # Reported here, so the warning lands on the dashboard like the bot's messages
+                self.notify(f"Ignoring unknown settings in {CONFIG_FILE}: {', '.join(self.config.ignored)}", "!", Fore.YELLOW)
+        except (OSError, ConfigError) as e:
+            self.notify(f"{CONFIG_FILE} not applied: {e}", "✗", Fore.RED)
+        if self.config.version == self._config_version:
+            return
+        self._config_version = self.config.version
+        self.backend.set_pause(self.config.input_pause)
+        # The compiled plan holds the delay sampler of the old settings
+        self.compile_plan()
+        self.notify("Configuration applied", "✓", Fore.GREEN)
+
+    def _handle_failure(self, scheduler):
+        """Applies the FailureHandler's decision for the last error. Returns False to stop the run"""
+        kind, error = self.last_error
+        decision = self.failures.on_failure(kind)
+        detail = f"{type(error).__name__}: {error}" if kind == 'unexpected' else error
+        message = f"{ERROR_LABELS[kind]}: {detail}"
+        # Retries and pauses are timed from now, not from the failed cycle's deadline
+        scheduler.reanchor()
+        if decision.action == FailureHandler.RETRY:
+            retries = FailureHandler.POLICIES[kind].retries
+            self.notify(f"{message} - retrying in {decision.delay:.1f}s ({decision.attempt}/{retries})", "✗", Fore.RED)
+            return scheduler.wait_next(decision.delay, self.wait)
+        if decision.action == FailureHandler.PAUSE and self.hotkeys.use_keyboard:
+            self.hotkeys.pause()
+            self.notify(f"{message} - bot paused. Press 'P' to resume, 'Q' to stop", "||", Fore.RED)
+            return True
+        self.notify(f"{message} - stopping", "✗", Fore.RED)
+        return False
+
+# ==================== BOT CONTROLLER ====================
+class BotController:
+    """Runs the snap cycle on a worker thread.
+
+    start/pause/resume/stop/status may be called from any thread. Pause
+    and stop go through the bot's HotkeyManager, so they also cut short a
+    delay in progress, exactly like the P and Q keys.
+    """
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.error = None
+        self._thread = None
+        self._done = threading.Event()
+        self._done.set()
+
+    @property
+    def running(self):
+        """True while the worker thread is alive"""
+        return not self._done.is_set()
+
+    def start(self, shortcut_user_count):
+        """Starts a run in the background"""
+        if self.running:
+            raise RuntimeError("The bot is already running")
+        # Reset before the worker exists, so a stop() right after start() is not lost
+        self.bot.hotkeys.reset()
+        self.error = None
+        self._done.clear()
+        self._thread = threading.Thread(target=self._worker, args=(shortcut_user_count,),
+                                        name="snap-bot", daemon=True)
+        self._thread.start()
+
+    def _worker(self, shortcut_user_count):
+        try:
+            # start() already reset the hotkeys
+            self.bot.run_bot(shortcut_user_count, reset=False)
+        except Exception as e:
+            self.error = e
+            self.bot.notify(f"Bot crashed: {e}", "✗", Fore.RED)
+        finally:
+            self._done.set()
+
+    def pause(self):
+        """Pauses the run"""
+        if self.running:
+            self.bot.hotkeys.pause()
+
+    def resume(self):
+        """Resumes a paused run"""
+        if self.running and self.bot.hotkeys.paused:
+            self.bot.hotkeys.toggle_pause()
+
+    def stop(self, timeout=5.0):
+        """Stops the run and waits up to timeout seconds. Returns True once the worker has exited"""
+        if self.running:
+            self.bot.hotkeys.request_stop()
+        return self.wait(timeout)
+
+    def wait(self, timeout=None):
+        """Waits for the worker to finish. Returns True if it has"""
+        if not self._done.wait(timeout):
+            return False
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        return True
+
+    def status(self):
+        """Snapshot of the run state and counters"""
+        hotkeys = self.bot.hotkeys
+        if not self.running:
+            state = "idle"
+        elif hotkeys.stopped:
+            state = "stopping"
+        elif hotkeys.paused:
+            state = "paused"
+        else:
+            state = "running"
+        status = self.bot.stats.snapshot()
+        status['state'] = state
+        scheduler = self.bot.stats.scheduler
+        status['cycles'] = scheduler.cycles if scheduler else 0
+        return status
+
+    def summary(self):
+        """JSON-ready summary of the current or last run"""
+        stats = self.bot.stats
+        scheduler = stats.scheduler
+        snapshot = stats.snapshot()
+        session = snapshot['sessions'][-1] if snapshot['sessions'] else {}
+        elapsed = scheduler.elapsed() if scheduler else 0.0
+        return {
+            'version': VERSION,
+            'state': self.status()['state'],
+            'snaps': snapshot['session_snaps'],
+            'sent': session.get('sent') or 0,
+            'errors': snapshot['errors_count'],
+            'error_kinds': snapshot['error_kinds'],
+            'cycles': scheduler.cycles if scheduler else 0,
+            'overruns': scheduler.overruns if scheduler else 0,
+            'elapsed_s': elapsed,
+            'snaps_per_minute': snapshot['session_snaps'] / elapsed * 60 if elapsed else 0.0,
+            'rolling': snapshot['rolling'],
+            'steps': stats.timings.summary(),
+            'error': str(self.error) if self.error else None
+        }
@@ -0,0 +1,167 @@
+"""Validated, hot-reloadable settings"""
+
+import os
+import json
+import math
+import random
+import functools
+import threading
+from pathlib import Path
+
+from colorama import Fore
+
+from .console import nice_print
+from .journal import write_json_atomic
+from .settings import CONFIG_FILE
+
+# ==================== CONFIGURATION CLASS ====================
+class ConfigError(ValueError):
+    """Raised when config.json or a new setting does not pass validation"""
+
+class Config:
+    """Bot settings, validated against SCHEMA and reloadable while the bot runs.
+
+    Every change goes through apply(): the complete new set of values is
+    validated before any of them is assigned, the delay samplers are
+    rebuilt and version is bumped, so the bot can pick changes up between
+    cycles. reload_if_changed() only stats config.json unless the file
+    has changed, so it is cheap enough to call every cycle.
+
+    Settings live in config.json inside state_dir, which is also where the
+    other state files of the bot are kept.
+    """
+
+    KINDS = {
+        'number': lambda v: isinstance(v, (int, float)) and not isinstance(v, bool) and math.isfinite(v),
+        'integer': lambda v: isinstance(v, int) and not isinstance(v, bool),
+        'boolean': lambda v: isinstance(v, bool)
+    }
+    # setting: (kind, minimum)
+    SCHEMA = {
+        'loop_delay': ('number', 0),
+        'click_delay': ('number', 0),
+        'position_delay': ('number', 0),
+        'random_delay': ('boolean', None),
+        'random_delay_min': ('number', 0),
+        'random_delay_max': ('number', 0),
+        'auto_stop_enabled': ('boolean', None),
+        'auto_stop_after': ('integer', 1),
+        'input_pause': ('number', 0),
+        'profile_enabled': ('boolean', None),
+        'verify_screen': ('boolean', None)
+    }
+
+    def __init__(self, state_dir, notify=nice_print):
+        self.state_dir = Path(state_dir)
+        self.path = self.state_dir / CONFIG_FILE
+        self.notify = notify
+        self.loop_delay = 5
+        self.click_delay = 1.2
+        self.position_delay = 0.5
+        self.random_delay = False
+        self.random_delay_min = 3
+        self.random_delay_max = 8
+        self.auto_stop_enabled = False
+        self.auto_stop_after = 100
+        self.input_pause = 0.1
+        self.profile_enabled = False
+        self.verify_screen = False
+        self.version = 0
+        self.ignored = []
+        self._mtime = None
+        self._lock = threading.Lock()
+        self._build_samplers()
+        self.load_config()
+    
+    def load_config(self):
+        """Loads configuration from JSON file, keeping the defaults if it is invalid"""
+        if self.path.exists():
+            try:
+                self._read()
+                if self.ignored:
+                    self.notify(f"Ignoring unknown settings in {CONFIG_FILE}: {', '.join(self.ignored)}", "!", Fore.YELLOW)
+                self.notify("Configuration loaded", "✓", Fore.GREEN)
+            except (OSError, ConfigError) as e:
+                self.notify(f"{CONFIG_FILE} not loaded, using defaults: {e}", "✗", Fore.RED)
+    
+    def _read(self):
+        # The mtime is remembered first, so an invalid file is reported once.
+        # Unknown settings are left in self.ignored for the caller to report
+        self._mtime = os.stat(self.path).st_mtime_ns
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+        except ValueError as e:
+            raise ConfigError(f"not valid JSON: {e}")
+        if not isinstance(data, dict):
+            raise ConfigError("expected a JSON object of settings")
+        self.apply(data)
+        self.ignored = [key for key in data if key not in self.SCHEMA]
+    
+    def reload_if_changed(self):
+        """Applies config.json again if it changed on disk. Returns True if it was applied.
+
+        Unknown settings in the file are listed in ignored.
+        """
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except OSError:
+            return False
+        if mtime == self._mtime:
+            return False
+        self._read()
+        return True
+    
+    def to_dict(self):
+        """Current settings as a JSON-ready dict"""
+        return {key: getattr(self, key) for key in self.SCHEMA}
+    
+    def validate(self, data):
+        """Returns the settings that applying data would give. Raises ConfigError listing every problem.
+
+        Unknown settings are skipped, so one stray key does not throw away
+        the rest of the file.
+        """
+        values = self.to_dict()
+        problems = []
+        for key, value in data.items():
+            if key not in self.SCHEMA:
+                continue
+            kind, minimum = self.SCHEMA[key]
+            if not self.KINDS[kind](value):
+                problems.append(f"'{key}' must be of type {kind}, got {value!r}")
+            elif minimum is not None and value < minimum:
+                problems.append(f"'{key}' must be at least {minimum}, got {value}")
+            else:
+                values[key] = value
+        if not problems and values['random_delay_min'] > values['random_delay_max']:
+            problems.append(f"'random_delay_min' ({values['random_delay_min']}) is greater than "
+                            f"'random_delay_max' ({values['random_delay_max']})")
+        if problems:
+            raise ConfigError("; ".join(problems))
+        return values
+    
+    def apply(self, data):
+        """Validates and applies a dict of settings, all or nothing"""
+        values = self.validate(data)
+        with self._lock:
+            for key, value in values.items():
+                setattr(self, key, value)
+            self._build_samplers()
+            self.version += 1
+    
+    def _build_samplers(self):
+        """Precomputes the zero-argument callables that draw the click and loop delays"""
+        if self.random_delay:
+            sampler = functools.partial(random.uniform, self.random_delay_min, self.random_delay_max)
+            self.click_sampler = self.loop_sampler = sampler
+        else:
+            self.click_sampler = lambda d=self.click_delay: d
+            self.loop_sampler = lambda d=self.loop_delay: d
+    
+    def save_config(self):
+        """Saves configuration to JSON file"""
+        write_json_atomic(self.path, self.to_dict())
+        # Our own write is not a change to reload
+        self._mtime = os.stat(self.path).st_mtime_ns
+        self.notify("Configuration saved", "✓", Fore.GREEN)
@@ -0,0 +1,59 @@
+"""Console output helpers. Importing this module does not initialise colorama"""
+
+import os
+import sys
+import platform
+
+from colorama import Fore
+
+from .settings import VERSION
+
+# ==================== HELPER FUNCTIONS ====================
+def clear():
+    """Clears the console"""
+    if platform.system() == "Windows":
+        os.system("cls")
+    else:
+        os.system("clear")
+
+def title(text):
+    """Sets the console window title"""
+    if sys.platform.startswith('win'):
+        import ctypes
+        try:
+            ctypes.windll.kernel32.SetConsoleTitleW(text)
+        except:
+            pass
+
+def format_status(text, status="-", color=Fore.WHITE):
+    """Formats a line with status icon"""
+    return f"{Fore.WHITE}[{Fore.RED}{status}{Fore.WHITE}] {color}{text}"
+
+def nice_print(text, status="-", color=Fore.WHITE):
+    """Formatted print with status icon"""
+    print(format_status(text, status, color))
+
+def banner_text():
+    """Returns the program banner"""
+    return rf"""
+{Fore.RED}
+    ┏━┓┏┓╻┏━┓┏━┓┏━┓┏━╸┏━┓┏━┓┏━╸┏┓ ┏━┓╺┳╸
+    ┗━┓┃┗┫┣━┫┣━┛┗━┓┃  ┃ ┃┣┳┛┣╸ ┣┻┓┃ ┃ ┃ 
+    ┗━┛╹ ╹╹ ╹╹  ┗━┛┗━╸┗━┛╹┗╸┗━╸┗━┛┗━┛ ╹ 
+                   
+{Fore.YELLOW}             Version {VERSION}
+{Fore.CYAN}Educational Purpose Only - By: Eddie-500 GITHUB
+{Fore.WHITE}═════════════════════════════════════════════════════
+"""
+
+def print_banner():
+    """Prints the program banner"""
+    print(banner_text())
+
+def format_rolling(rolling):
+    """One-line summary of a CycleMetrics rollup"""
+    if not rolling['cycles']:
+        return "Last minute: no cycles yet"
+    return (f"Last {rolling['window_s']:.0f}s: {rolling['snaps_per_minute']:.1f} snaps/min, "
+            f"errors {rolling['error_rate']:.0%}, cycle p50 {rolling['p50_s']:.2f}s "
+            f"p95 {rolling['p95_s']:.2f}s")
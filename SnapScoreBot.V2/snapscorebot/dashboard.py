@@ -0,0 +1,108 @@
+"""In-place terminal view of a running bot"""
+
+import sys
+import time
+import threading
+
+from colorama import Fore
+
+from .console import format_status, format_rolling, banner_text, title
+from .settings import VERSION, DASHBOARD_REFRESH_HZ
+
+# ==================== LIVE DASHBOARD ====================
+class Dashboard:
+    """In-place terminal view of a running bot.
+
+    The banner is drawn once. A background thread then refreshes at most
+    DASHBOARD_REFRESH_HZ times per second and rewrites only the lines whose
+    text changed, using ANSI cursor positioning (translated by colorama on
+    Windows), so the snap cycle never waits on the console. The console
+    title is updated the same way.
+    """
+
+    def __init__(self, bot, controller=None, refresh_hz=DASHBOARD_REFRESH_HZ):
+        self.bot = bot
+        self.controller = controller
+        self.interval = 1 / refresh_hz
+        self.first_row = 1
+        self.message = ""
+        self._drawn = {}
+        self._title = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def lines(self):
+        """Current dashboard lines"""
+        stats = self.bot.stats.snapshot()
+        hotkeys = self.bot.hotkeys
+        footer = format_status("Press ENTER to return to the menu (the bot keeps running)", ">", Fore.WHITE)
+        if self.controller is not None and not self.controller.running:
+            state = format_status("Status: Stopped", "■", Fore.YELLOW)
+            footer = format_status("Press ENTER to return to the menu", ">", Fore.WHITE)
+        elif hotkeys.stopped:
+            state = format_status("Status: Stopping", "!", Fore.YELLOW)
+        elif hotkeys.paused:
+            state = format_status("Status: Paused (press 'P' to resume)", "||", Fore.YELLOW)
+        else:
+            state = format_status("Status: Running (press 'Q' to stop, 'P' to pause)", "▶", Fore.GREEN)
+        return [
+            format_status(f"Snaps sent this session: {stats['session_snaps']}", "📊", Fore.CYAN),
+            format_status(f"Total historical: {stats['total_snaps_sent']}", "📈", Fore.CYAN),
+            format_status(f"Elapsed time: {stats['elapsed']}", "⏱", Fore.CYAN),
+            format_status(f"Errors this session: {stats['errors_count']}", "✗", Fore.RED),
+            format_status(format_rolling(stats['rolling']), "📉", Fore.CYAN),
+            state,
+            self.message,
+            footer
+        ]
+
+    def notify(self, text, status="-", color=Fore.WHITE):
+        """Shows a message on the dashboard's message line"""
+        self.message = format_status(text, status, color)
+
+    def render(self):
+        """Rewrites the lines that changed since the last render"""
+        start = time.perf_counter()
+        lines = self.lines()
+        out = []
+        with self._lock:
+            for i, line in enumerate(lines):
+                if self._drawn.get(i) != line:
+                    self._drawn[i] = line
+                    out.append(f"\x1b[{self.first_row + i};1H\x1b[2K{line}")
+            if out:
+                # Park the cursor below the dashboard, where ENTER is typed
+                out.append(f"\x1b[{self.first_row + len(lines)};1H")
+                sys.stdout.write("".join(out))
+                sys.stdout.flush()
+        stats = self.bot.stats
+        new_title = f"SnapScoreBot v{VERSION} | Sent: {stats.total_snaps_sent} | Time: {stats.get_elapsed_time()}"
+        if new_title != self._title:
+            self._title = new_title
+            title(new_title)
+        stats.timings.add('render', time.perf_counter() - start)
+
+    def start(self):
+        """Clears the screen once, draws the banner and starts refreshing"""
+        banner = banner_text()
+        sys.stdout.write("\x1b[2J\x1b[H")
+        print(banner)
+        self.first_row = banner.count("\n") + 2
+        self._drawn = {}
+        self._stop.clear()
+        self.render()
+        self._thread = threading.Thread(target=self._refresh_loop, name="dashboard", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stops refreshing and draws the final state"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.render()
+
+    def _refresh_loop(self):
+        while not self._stop.wait(self.interval):
+            self.render()
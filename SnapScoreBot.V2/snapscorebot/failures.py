@@ -0,0 +1,94 @@
+"""Error classification, retry backoff and the circuit breaker"""
+
+from collections import namedtuple
+
+from .backends import BackendError, FailSafeError
+from .plan import PlanError, MissingPositionError
+from .screen import ScreenMismatchError
+
+# ==================== FAILURE HANDLING ====================
+ERROR_LABELS = {
+    'failsafe': "Fail-safe triggered",
+    'missing_position': "Missing position",
+    'plan': "Invalid action plan",
+    'screen': "Screen changed",
+    'backend': "Input error",
+    'unexpected': "Unexpected error"
+}
+
+def classify_error(error):
+    """Maps an exception raised during a cycle to one of ERROR_LABELS"""
+    if isinstance(error, FailSafeError):
+        return 'failsafe'
+    if isinstance(error, MissingPositionError):
+        return 'missing_position'
+    if isinstance(error, PlanError):
+        return 'plan'
+    if isinstance(error, ScreenMismatchError):
+        return 'screen'
+    if isinstance(error, BackendError):
+        return 'backend'
+    # Anything else is a bug: retrying it as an input glitch would only hide it
+    return 'unexpected'
+
+ErrorPolicy = namedtuple('ErrorPolicy', 'retries base_delay max_delay on_exhausted')
+Decision = namedtuple('Decision', 'action delay attempt')
+
+class FailureHandler:
+    """Decides what the loop does after a failed cycle.
+
+    Each error class has a policy: how many consecutive retries it gets,
+    spaced by capped exponential backoff, and what happens when they run
+    out. A retry replaces the loop delay, so a transient glitch (or a page
+    that is still loading) costs a short wait instead of a whole cycle.
+    Fail-safe hits, plan problems and unexpected errors get no retries,
+    since repeating the sequence cannot fix them.
+
+    The circuit breaker opens when a class runs out of retries or after
+    BREAKER_THRESHOLD consecutive failures of any class, and the run is
+    paused (or stopped) instead of repeating a failing sequence. Once the
+    run is resumed the breaker is half-open: the next success closes it,
+    and the next failure opens it again without retries.
+    """
+
+    RETRY, PAUSE, STOP = 'retry', 'pause', 'stop'
+    POLICIES = {
+        'failsafe': ErrorPolicy(0, 0.0, 0.0, PAUSE),
+        'missing_position': ErrorPolicy(0, 0.0, 0.0, STOP),
+        'plan': ErrorPolicy(0, 0.0, 0.0, STOP),
+        'screen': ErrorPolicy(2, 1.0, 4.0, PAUSE),
+        'backend': ErrorPolicy(4, 0.5, 8.0, PAUSE),
+        'unexpected': ErrorPolicy(0, 0.0, 0.0, STOP)
+    }
+    BREAKER_THRESHOLD = 6
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """Closes the breaker and forgets past failures"""
+        self.state = 'closed'
+        self.consecutive = 0
+        self.streaks = {}
+
+    def on_success(self):
+        """Closes the breaker after a successful cycle"""
+        if self.consecutive or self.state != 'closed':
+            self.reset()
+
+    def on_failure(self, kind):
+        """Returns the Decision for a failed cycle of the given class"""
+        policy = self.POLICIES[kind]
+        self.consecutive += 1
+        attempt = self.streaks[kind] = self.streaks.get(kind, 0) + 1
+        if (self.state == 'half_open' or attempt > policy.retries
+                or self.consecutive >= self.BREAKER_THRESHOLD):
+            self.state = 'open'
+            return Decision(policy.on_exhausted, 0.0, attempt)
+        delay = min(policy.max_delay, policy.base_delay * 2 ** (attempt - 1))
+        return Decision(self.RETRY, delay, attempt)
+
+    def on_resume(self):
+        """Moves an open breaker to half-open once the run continues"""
+        if self.state == 'open':
+            self.state = 'half_open'
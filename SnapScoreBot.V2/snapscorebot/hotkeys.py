@@ -0,0 +1,151 @@
+"""Keyboard controls: stop/pause state and interruptible waits"""
+
+import time
+import threading
+
+from colorama import Fore
+
+from .console import nice_print
+from .lazy import LazyModule
+
+# keyboard is only imported once a hotkey is bound or awaited
+keyboard = LazyModule('keyboard')
+
+# ==================== HOTKEY MANAGER ====================
+class HotkeyManager:
+    """Event-driven hotkeys with interruptible waits.
+
+    Keys are delivered by the keyboard hook thread through callbacks, so
+    nothing busy-polls while waiting. Stop and pause are kept as shared
+    state behind a condition variable: any sleep done through `sleep()`
+    wakes up as soon as one of them changes.
+
+    With use_keyboard=False no hooks are installed, which lets headless
+    runs drive stop/pause programmatically.
+    """
+
+    def __init__(self, use_keyboard=True):
+        self._cond = threading.Condition()
+        self._hotkeys = []
+        self.use_keyboard = use_keyboard
+        self.notify = nice_print
+        self.stopped = False
+        self.paused = False
+        self._paused_at = None
+        self._paused_total = 0.0
+
+    def wait_for_key(self, *keys, timeout=None):
+        """Blocks until one of the keys is pressed, returns its name (or None on timeout)"""
+        pressed = []
+        event = threading.Event()
+
+        def on_key(name):
+            if not event.is_set():
+                pressed.append(name)
+                event.set()
+
+        handles = [keyboard.add_hotkey(key, on_key, args=(key,)) for key in keys]
+        try:
+            event.wait(timeout)
+        finally:
+            for handle in handles:
+                keyboard.remove_hotkey(handle)
+        return pressed[0] if pressed else None
+
+    def bind_controls(self, stop_key='q', pause_key='p'):
+        """Hooks the stop/pause keys for a bot session"""
+        if not self.use_keyboard:
+            return
+        self._hotkeys.append(keyboard.add_hotkey(stop_key, self.request_stop))
+        # Pause toggles on release so a held key does not flip it repeatedly
+        self._hotkeys.append(keyboard.add_hotkey(pause_key, self.toggle_pause, trigger_on_release=True))
+
+    def unbind_controls(self):
+        """Removes the hooks installed by bind_controls"""
+        for handle in self._hotkeys:
+            try:
+                keyboard.remove_hotkey(handle)
+            except (KeyError, ValueError):
+                pass
+        self._hotkeys = []
+
+    def reset(self):
+        """Clears the stop and pause state"""
+        with self._cond:
+            self.stopped = False
+            self.paused = False
+            self._paused_at = None
+            self._paused_total = 0.0
+            self._cond.notify_all()
+
+    def request_stop(self):
+        """Asks the running session to stop"""
+        with self._cond:
+            if self.stopped:
+                return
+            self.stopped = True
+            self._cond.notify_all()
+        self.notify("Stopping bot...", "!", Fore.YELLOW)
+
+    def toggle_pause(self):
+        """Flips the pause state"""
+        self._set_paused(None)
+
+    def pause(self):
+        """Pauses the session unless it is already paused"""
+        self._set_paused(True)
+
+    def _set_paused(self, paused):
+        with self._cond:
+            if self.stopped:
+                return
+            if paused is None:
+                paused = not self.paused
+            if paused == self.paused:
+                return
+            self.paused = paused
+            if paused:
+                self._paused_at = time.monotonic()
+            else:
+                self._paused_total += time.monotonic() - self._paused_at
+                self._paused_at = None
+            self._cond.notify_all()
+        if paused:
+            self.notify("Bot paused. Press 'P' to resume", "||", Fore.YELLOW)
+        else:
+            self.notify("Bot resumed", "▶", Fore.GREEN)
+
+    def paused_seconds(self):
+        """Total time spent paused since the last reset, including a pause in progress"""
+        with self._cond:
+            if self._paused_at is not None:
+                return self._paused_total + time.monotonic() - self._paused_at
+            return self._paused_total
+
+    def wait_while_paused(self):
+        """Blocks while paused. Returns False if a stop was requested"""
+        with self._cond:
+            while self.paused and not self.stopped:
+                self._cond.wait()
+            return not self.stopped
+
+    def sleep(self, seconds):
+        """Sleeps for the given time, returns False early if a stop is requested.
+
+        Time spent paused does not count towards the sleep, so a pause in the
+        middle of a delay resumes with the remaining part of that delay.
+        """
+        end = time.monotonic() + seconds
+        with self._cond:
+            while not self.stopped:
+                if self.paused:
+                    paused_at = time.monotonic()
+                    while self.paused and not self.stopped:
+                        self._cond.wait()
+                    end += time.monotonic() - paused_at
+                    continue
+                remaining = end - time.monotonic()
+                if remaining <= 0:
+                    return True
+                self._cond.wait(remaining)
+            return False
@@ -0,0 +1,74 @@
+"""Crash-safe persistence: atomic JSON writes and the append-only journal"""
+
+import os
+import time
+import json
+from pathlib import Path
+
+# ==================== SESSION JOURNAL ====================
+def write_json_atomic(path, data):
+    """Writes JSON to a temporary file and renames it over path"""
+    tmp = f"{path}.tmp"
+    with open(tmp, 'w') as f:
+        json.dump(data, f, indent=4)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+class SessionJournal:
+    """Append-only JSONL journal with batched flush/fsync.
+
+    Records are flushed to disk every flush_every appends or when
+    flush_interval seconds have passed since the last flush, whichever
+    comes first. A torn last line (crash mid-write) is skipped on replay.
+    """
+
+    def __init__(self, path, flush_every=10, flush_interval=2.0):
+        self.path = path
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self._file = None
+        self._pending = 0
+        self._last_flush = time.monotonic()
+
+    def append(self, record):
+        """Appends one record, flushing when the batch is full or old enough"""
+        if self._file is None:
+            self._file = open(self.path, 'a')
+        self._file.write(json.dumps(record, separators=(',', ':')) + "\n")
+        self._pending += 1
+        if self._pending >= self.flush_every or time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        """Forces pending records to disk"""
+        if self._file is not None and self._pending:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+        self._pending = 0
+        self._last_flush = time.monotonic()
+
+    def replay(self, after_seq=0):
+        """Yields the records with a sequence number above after_seq"""
+        if not Path(self.path).exists():
+            return
+        with open(self.path, 'r') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if record.get('seq', 0) > after_seq:
+                    yield record
+
+    def truncate(self):
+        """Empties the journal once a snapshot covers it"""
+        self.close()
+        open(self.path, 'w').close()
+
+    def close(self):
+        """Flushes and closes the journal file"""
+        if self._file is not None:
+            self.flush()
+            self._file.close()
+            self._file = None
@@ -0,0 +1,16 @@
+"""Deferred imports for optional or slow-to-import modules"""
+
+import importlib
+
+# ==================== LAZY IMPORTS ====================
+class LazyModule:
+    """Stands in for a module and imports it on first attribute access"""
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
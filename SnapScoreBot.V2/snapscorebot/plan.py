@@ -0,0 +1,132 @@
+"""The snap sequence as data, and its compiled form"""
+
+import json
+from pathlib import Path
+
+# ==================== ACTION PLAN ====================
+DEFAULT_ACTION_PLAN = {
+    'positions': {
+        'camera': 'Camera button',
+        'send_to': 'Send to button',
+        'shortcut': 'Shortcut button',
+        'select_all': 'Select All button'
+    },
+    'steps': [
+        {'action': 'move', 'target': 'camera'},
+        {'action': 'click', 'first_cycle_only': True},
+        {'action': 'delay'},
+        {'action': 'click'},
+        {'action': 'delay'},
+        {'action': 'move', 'target': 'send_to'},
+        {'action': 'click'},
+        {'action': 'delay'},
+        {'action': 'move', 'target': 'shortcut'},
+        {'action': 'click'},
+        {'action': 'delay'},
+        {'action': 'move', 'target': 'select_all'},
+        {'action': 'click'},
+        {'action': 'delay'},
+        {'action': 'move', 'target': 'send_to'},
+        {'action': 'click'}
+    ]
+}
+
+# Opcodes of a compiled plan
+OP_MOVE, OP_CLICK, OP_DELAY, OP_VERIFY = 0, 1, 2, 3
+
+class PlanError(ValueError):
+    """Raised when actions.json does not describe a valid plan"""
+
+class MissingPositionError(PlanError):
+    """Raised when the plan uses a position that has not been captured"""
+
+class CompiledPlan:
+    """Flat, pre-resolved snap sequence.
+
+    first and steady are tuples of (opcode, argument): a Point for
+    OP_MOVE, None for OP_CLICK, a zero-argument delay sampler for
+    OP_DELAY and a position name for OP_VERIFY. first is used on the
+    first cycle of a session, so steps marked first_cycle_only cost
+    nothing afterwards. inputs is the number of moves and clicks in a
+    steady cycle.
+    """
+
+    def __init__(self, first, steady):
+        self.first = first
+        self.steady = steady
+        self.inputs = sum(1 for op, _ in steady if op in (OP_MOVE, OP_CLICK))
+
+class ActionPlan:
+    """The snap sequence as data, loaded from actions.json"""
+
+    def __init__(self, data):
+        self.positions = data['positions']
+        self.steps = data['steps']
+        self.validate()
+
+    @classmethod
+    def load(cls, path):
+        """Loads the plan, writing the default one first if the file is missing"""
+        if not Path(path).exists():
+            with open(path, 'w') as f:
+                json.dump(DEFAULT_ACTION_PLAN, f, indent=4)
+            return cls(DEFAULT_ACTION_PLAN)
+        try:
+            with open(path, 'r') as f:
+                data = json.load(f)
+        except ValueError as e:
+            raise PlanError(f"{path} is not valid JSON: {e}")
+        if not isinstance(data, dict) or 'positions' not in data or 'steps' not in data:
+            raise PlanError(f"{path} must be an object with 'positions' and 'steps'")
+        return cls(data)
+
+    def validate(self):
+        """Checks the plan's structure, raises PlanError describing the first problem"""
+        if not isinstance(self.positions, dict) or not self.positions:
+            raise PlanError("'positions' must map position names to descriptions")
+        if not isinstance(self.steps, list) or not self.steps:
+            raise PlanError("'steps' must be a non-empty list")
+        for i, step in enumerate(self.steps, 1):
+            action = step.get('action') if isinstance(step, dict) else None
+            if action == 'move':
+                target = step.get('target')
+                if not isinstance(target, str):
+                    raise PlanError(f"Step {i}: move target must be a position name, got {target!r}")
+                if target not in self.positions:
+                    raise PlanError(f"Step {i}: move target {target!r} is not one of {list(self.positions)}")
+            elif action == 'delay':
+                seconds = step.get('seconds', 'click')
+                if seconds != 'click' and (isinstance(seconds, bool) or not isinstance(seconds, (int, float)) or seconds < 0):
+                    raise PlanError(f"Step {i}: delay seconds must be 'click' or a number >= 0, got {seconds!r}")
+            elif action != 'click':
+                raise PlanError(f"Step {i}: unknown action {action!r} (expected move, click or delay)")
+        # Every cycle counts as a snap, so one that sends nothing must be rejected
+        if not any(step['action'] == 'click' and not step.get('first_cycle_only') for step in self.steps):
+            raise PlanError("'steps' must click at least once outside the first_cycle_only steps")
+
+    def compile(self, positions, click_delay, verified=()):
+        """Resolves targets to Points and delays to samplers.
+
+        click_delay is the sampler used by delays without explicit seconds.
+        Moves to a target in verified are preceded by an OP_VERIFY step.
+        Raises MissingPositionError if a target has no captured position.
+        """
+        missing = [name for name in self.positions if name not in positions]
+        if missing:
+            raise MissingPositionError(f"No saved position for: {', '.join(missing)}")
+        first, steady = [], []
+        for step in self.steps:
+            action = step['action']
+            if action == 'move':
+                ops = [(OP_MOVE, positions[step['target']])]
+                if step['target'] in verified:
+                    ops.insert(0, (OP_VERIFY, step['target']))
+            elif action == 'click':
+                ops = [(OP_CLICK, None)]
+            else:
+                seconds = step.get('seconds', 'click')
+                ops = [(OP_DELAY, click_delay if seconds == 'click' else (lambda s=float(seconds): s))]
+            first.extend(ops)
+            if not step.get('first_cycle_only'):
+                steady.extend(ops)
+        return CompiledPlan(tuple(first), tuple(steady))
@@ -0,0 +1,116 @@
+"""Verification of saved positions against cached pixel templates"""
+
+import importlib.util
+from pathlib import Path
+
+from colorama import Fore
+
+from .backends import Point
+from .console import nice_print
+
+# ==================== SCREEN VERIFICATION ====================
+def numpy_available():
+    """numpy is optional: without it screen verification is disabled"""
+    return importlib.util.find_spec('numpy') is not None
+
+class ScreenMismatchError(Exception):
+    """Raised when the screen around a saved position no longer matches its template"""
+
+class ScreenVerifier:
+    """Checks that a button is still under its saved position.
+
+    While positions are captured, a small patch of pixels around each one
+    is grabbed and saved to TEMPLATES_FILE. check() grabs only the patches
+    of the positions it is asked about and compares them with their
+    templates in one vectorized pass. The comparison uses zero-mean
+    normalized correlation, which tolerates the tint of a hovered button.
+    Flat patches have no correlation, so they use the mean absolute
+    difference instead. Requires numpy (see numpy_available).
+    """
+
+    RADIUS = 8
+    MIN_CORRELATION = 0.8
+    MAX_DIFFERENCE = 20.0
+    FLAT_STD = 4.0
+
+    def __init__(self, path, notify=nice_print):
+        import numpy
+        self.np = numpy
+        self.path = path
+        self.notify = notify
+        self.points = {}
+        self.regions = {}
+        self.patches = {}
+        self._index = {}
+
+    def region(self, point):
+        """The (left, top, width, height) patch around a point"""
+        size = 2 * self.RADIUS + 1
+        return (max(0, point.x - self.RADIUS), max(0, point.y - self.RADIUS), size, size)
+
+    def _pixels(self, image):
+        return self.np.asarray(image, dtype=self.np.uint8)[:, :, :3]
+
+    def capture(self, backend, name, point):
+        """Grabs and stores the template around a captured position"""
+        region = self.region(point)
+        self.points[name] = point
+        self.regions[name] = region
+        self.patches[name] = self._pixels(backend.grab(region)).copy()
+        self._prepare()
+
+    def matches(self, positions):
+        """True if there is a template for each position, captured at that position"""
+        return bool(positions) and all(self.points.get(name) == point for name, point in positions.items())
+
+    def _prepare(self):
+        """Stacks the templates and precomputes what check() needs from them"""
+        np = self.np
+        names = list(self.patches)
+        self._index = {name: i for i, name in enumerate(names)}
+        templates = np.stack([self.patches[name] for name in names]).astype(np.float32)
+        self._templates = templates
+        self._centered = templates - templates.mean(axis=(1, 2, 3), keepdims=True)
+        self._norms = np.sqrt((self._centered * self._centered).sum(axis=(1, 2, 3)))
+        self._flat = templates.std(axis=(1, 2, 3)) < self.FLAT_STD
+
+    def check(self, backend, names):
+        """Returns the names whose patch no longer matches its template"""
+        np = self.np
+        index = [self._index[name] for name in names]
+        grabs = np.stack([self._pixels(backend.grab(self.regions[name])) for name in names]).astype(np.float32)
+        templates = self._templates[index]
+        difference = np.abs(grabs - templates).mean(axis=(1, 2, 3))
+        centered = grabs - grabs.mean(axis=(1, 2, 3), keepdims=True)
+        norms = np.sqrt((centered * centered).sum(axis=(1, 2, 3)))
+        correlation = (centered * self._centered[index]).sum(axis=(1, 2, 3)) / np.maximum(norms * self._norms[index], 1e-6)
+        ok = np.where(self._flat[index], difference <= self.MAX_DIFFERENCE, correlation >= self.MIN_CORRELATION)
+        return [name for name, good in zip(names, ok) if not good]
+
+    def save(self):
+        """Writes the templates to path"""
+        np = self.np
+        names = list(self.patches)
+        with open(self.path, 'wb') as f:
+            np.savez_compressed(f, names=np.array(names),
+                                points=np.array([self.points[name] for name in names]),
+                                regions=np.array([self.regions[name] for name in names]),
+                                patches=np.stack([self.patches[name] for name in names]))
+
+    def load(self):
+        """Loads saved templates. Returns False if there are none or they cannot be read"""
+        if not Path(self.path).exists():
+            return False
+        try:
+            with self.np.load(self.path) as data:
+                names = [str(name) for name in data['names']]
+                self.points = {name: Point(*map(int, point)) for name, point in zip(names, data['points'])}
+                self.regions = {name: tuple(map(int, region)) for name, region in zip(names, data['regions'])}
+                self.patches = dict(zip(names, data['patches']))
+        except (OSError, ValueError, KeyError) as e:
+            self.notify(f"Could not read {self.path}: {e}", "✗", Fore.RED)
+            return False
+        if not self.patches:
+            return False
+        self._prepare()
+        return True
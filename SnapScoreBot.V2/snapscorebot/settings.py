@@ -0,0 +1,23 @@
+"""Constants shared by the engine and the frontend"""
+
+# ==================== SETTINGS ====================
+TUTORIAL_VIDEO = "Soon"
+VERSION = "2.0.0"
+CREDITS = "Eddie-500 - Educational Purpose Only"
+CONFIG_FILE = "config.json"
+STATS_FILE = "stats.json"
+POSITIONS_FILE = "positions.json"
+ACTIONS_FILE = "actions.json"
+TEMPLATES_FILE = "templates.npz"
+JOURNAL_FILE = "stats.journal.jsonl"
+HISTORY_FILE = "stats.history.jsonl"
+RECENT_RUNS = 5
+TIMINGS_FILE = "timings.json"
+DASHBOARD_REFRESH_HZ = 4
+METRICS_WINDOW = 60.0
+METRICS_CAPACITY = 1024
+MIN_CYCLE_GAP = 0.25
+PROFILE_FILE = "run_bot.prof"
+VERSION_URL = "https://raw.githubusercontent.com/useragents/Snapchat-Snapscore-Botter/refs/heads/main/version.txt"
+VERSION_CACHE_FILE = "version_cache.json"
+VERSION_CACHE_TTL = 24 * 3600
@@ -0,0 +1,243 @@
+"""Snap counters and run history"""
+
+import time
+import json
+import threading
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+
+from colorama import Fore
+
+from .console import nice_print
+from .journal import write_json_atomic, SessionJournal
+from .settings import STATS_FILE, JOURNAL_FILE, HISTORY_FILE, RECENT_RUNS
+from .timing import StepTimer, CycleMetrics
+
+# ==================== STATISTICS CLASS ====================
+class Statistics:
+    """Snap counters, persisted through a SessionJournal.
+
+    Every cycle is appended to the journal, so a crash loses at most the
+    last unflushed batch. stats.json is a snapshot that is rewritten
+    atomically every compact_every cycles and at the end of each run. It
+    only holds the totals and the run in progress: finished runs are
+    appended to the history file once, so a compaction costs the same
+    however many runs were made. The last RECENT_RUNS runs are kept in
+    memory for display.
+
+    The bot thread updates the counters while menus and the dashboard read
+    them, so updates go through the methods below under self.lock and
+    readers use snapshot(). stats.json, the journal and the history file
+    are kept in state_dir.
+    """
+
+    def __init__(self, state_dir, compact_every=100, notify=nice_print):
+        self.total_snaps_sent = 0
+        self.session_snaps = 0
+        self.scheduler = None
+        self.errors_count = 0
+        self.error_kinds = {}
+        self.notify = notify
+        self.stats_file = Path(state_dir) / STATS_FILE
+        self.journal = SessionJournal(Path(state_dir) / JOURNAL_FILE)
+        self.history_log = SessionJournal(Path(state_dir) / HISTORY_FILE, flush_every=1)
+        self.history = deque(maxlen=RECENT_RUNS)
+        self.compact_every = compact_every
+        self.seq = 0
+        self.sessions = []
+        self.current_session = None
+        self._since_compaction = 0
+        self.lock = threading.RLock()
+        self.timings = StepTimer()
+        self.metrics = CycleMetrics()
+        self.load_stats()
+    
+    def load_stats(self):
+        """Loads the last snapshot and the recent runs, then replays the journal written after them"""
+        self.load_history()
+        if self.stats_file.exists():
+            try:
+                with open(self.stats_file, 'r') as f:
+                    data = json.load(f)
+                self.total_snaps_sent = data.get('total_snaps_sent', 0)
+                self.seq = data.get('seq', 0)
+                # Older snapshots kept every run here; ended ones move to the history file below
+                self.sessions = data.get('sessions', [])
+                if 'seq' not in data and 'last_session' in data:
+                    # stats.json written before the journal only kept the last run
+                    self.sessions.append({'id': data['last_session'], 'started_at': None,
+                                          'ended_at': data['last_session'],
+                                          'snaps': data.get('last_session_snaps', 0), 'sent': None, 'errors': None})
+            except (OSError, ValueError) as e:
+                self.notify(f"Could not read {self.stats_file.name}: {e}", "✗", Fore.RED)
+        
+        replayed = 0
+        for record in self.journal.replay(self.seq):
+            self._apply(record)
+            replayed += 1
+        for session in self.sessions:
+            if session['ended_at'] is None:
+                # A run that never wrote its end record was interrupted
+                session['ended_at'] = session.get('last_cycle_at') or session['started_at']
+                session['recovered'] = True
+        archived = self._archive_ended()
+        if replayed:
+            self.notify(f"Recovered {replayed} journal records", "✓", Fore.GREEN)
+        if replayed or archived:
+            self.save_stats()
+    
+    def load_history(self):
+        """Loads the last RECENT_RUNS runs from the history file"""
+        self.history.clear()
+        try:
+            with open(self.history_log.path, 'r') as f:
+                for line in f:
+                    try:
+                        self.history.append(json.loads(line))
+                    except ValueError:
+                        continue  # torn last line
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            self.notify(f"Could not read {HISTORY_FILE}: {e}", "✗", Fore.RED)
+    
+    def _archive_ended(self):
+        """Appends ended runs to the history file and drops them from the snapshot. Returns how many moved"""
+        ended = [session for session in self.sessions if session['ended_at'] is not None]
+        if not ended:
+            return 0
+        # A run can already be there if the last save was cut short after archiving it
+        archived = {session['id'] for session in self.history}
+        for session in ended:
+            if session['id'] not in archived:
+                self.history_log.append(session)
+                self.history.append(session)
+        self.sessions = [session for session in self.sessions if session['ended_at'] is None]
+        return len(ended)
+    
+    def _apply(self, record):
+        """Applies one journal record to the counters and session history"""
+        self.seq = record['seq']
+        kind = record['type']
+        if kind == 'start':
+            self.sessions.append({'id': record['session'], 'started_at': record['at'], 'ended_at': None,
+                                  'snaps': 0, 'sent': 0, 'errors': 0})
+            return
+        session = self._find_session(record['session'])
+        if kind == 'cycle':
+            if record['ok']:
+                self.total_snaps_sent += record['sent']
+            if session is not None:
+                session['snaps' if record['ok'] else 'errors'] += 1
+                if record['ok']:
+                    session['sent'] += record['sent']
+                session['last_cycle_at'] = record['at']
+        elif kind == 'end' and session is not None:
+            session['ended_at'] = record['at']
+    
+    def _find_session(self, session_id):
+        for session in reversed(self.sessions):
+            if session['id'] == session_id:
+                return session
+        return None
+    
+    def _append(self, kind, **fields):
+        """Applies a record and appends it to the journal"""
+        record = {'seq': self.seq + 1, 'type': kind, 'at': datetime.now().isoformat(), **fields}
+        self._apply(record)
+        self.journal.append(record)
+        return record
+    
+    def start_session(self):
+        """Opens a new run in the session history"""
+        with self.lock:
+            record = self._append('start', session=datetime.now().isoformat())
+            self.current_session = record['session']
+    
+    def record_cycle(self, ok, sent=0, error=None):
+        """Counts one cycle, journals it, and compacts every compact_every cycles.
+
+        error is the class of a failed cycle (see classify_error).
+        """
+        start = time.perf_counter()
+        with self.lock:
+            if ok:
+                self.session_snaps += 1
+                self._append('cycle', session=self.current_session, ok=True, sent=sent)
+            else:
+                self.errors_count += 1
+                self.error_kinds[error] = self.error_kinds.get(error, 0) + 1
+                self._append('cycle', session=self.current_session, ok=False, sent=0, error=error)
+            self._since_compaction += 1
+            if self._since_compaction >= self.compact_every:
+                self.save_stats()
+        self.timings.add('persist', time.perf_counter() - start)
+    
+    def end_session(self):
+        """Closes the current run and writes a snapshot"""
+        with self.lock:
+            if self.current_session is not None:
+                self._append('end', session=self.current_session)
+                self.current_session = None
+            self._archive_ended()
+            self.save_stats()
+    
+    def save_stats(self):
+        """Atomically writes the snapshot, then truncates the journal it covers"""
+        with self.lock:
+            runs = self.recent_sessions()
+            last = runs[-1] if runs else None
+            data = {
+                'total_snaps_sent': self.total_snaps_sent,
+                'last_session': (last['ended_at'] if last and last['ended_at'] else datetime.now().isoformat()),
+                'last_session_snaps': last['snaps'] if last else self.session_snaps,
+                'seq': self.seq,
+                'sessions': self.sessions
+            }
+            self.journal.flush()
+            write_json_atomic(self.stats_file, data)
+            self.journal.truncate()
+            self._since_compaction = 0
+    
+    def reset(self):
+        """Clears all counters and the session history"""
+        with self.lock:
+            self.total_snaps_sent = 0
+            self.session_snaps = 0
+            self.errors_count = 0
+            self.error_kinds = {}
+            self.sessions = [s for s in self.sessions if s['id'] == self.current_session]
+            self.history.clear()
+            self.history_log.truncate()
+            self.timings.reset()
+            self.metrics.reset()
+            self.save_stats()
+    
+    def recent_sessions(self):
+        """The last RECENT_RUNS runs, oldest first, including the one in progress"""
+        with self.lock:
+            return (list(self.history) + self.sessions)[-RECENT_RUNS:]
+    
+    def snapshot(self):
+        """Consistent copy of the counters for display"""
+        with self.lock:
+            return {
+                'total_snaps_sent': self.total_snaps_sent,
+                'session_snaps': self.session_snaps,
+                'errors_count': self.errors_count,
+                'error_kinds': dict(self.error_kinds),
+                'sessions': [dict(session) for session in self.recent_sessions()],
+                'elapsed': self.get_elapsed_time(),
+                'rolling': self.metrics.rollup()
+            }
+    
+    def get_elapsed_time(self):
+        """Gets formatted elapsed time"""
+        if self.scheduler and self.scheduler.started_at is not None:
+            elapsed = self.scheduler.elapsed()
+            hours = int(elapsed // 3600)
+            minutes = int((elapsed % 3600) // 60)
+            seconds = int(elapsed % 60)
+            return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
+        return "00:00:00"
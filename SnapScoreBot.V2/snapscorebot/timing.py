@@ -0,0 +1,259 @@
+"""Step latencies, rolling cycle metrics and the cycle scheduler"""
+
+import time
+import json
+import math
+import threading
+from array import array
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+
+from .settings import METRICS_WINDOW, METRICS_CAPACITY
+
+# ==================== STEP TIMINGS ====================
+def percentile(sorted_samples, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_samples:
+        return 0.0
+    rank = max(0, min(len(sorted_samples) - 1, int(round(pct / 100 * len(sorted_samples))) - 1))
+    return sorted_samples[rank]
+
+class StepTimer:
+    """Latency samples for each step of the snap cycle.
+
+    Only the most recent max_samples per step are kept, so long runs use
+    bounded memory. Summaries are computed on demand. Samples may be added
+    from the bot and dashboard threads while a menu reads the summary.
+    """
+
+    STEPS = ('move', 'click', 'verify', 'sleep', 'render', 'persist', 'jitter')
+
+    def __init__(self, max_samples=5000):
+        self.max_samples = max_samples
+        self.samples = {step: deque(maxlen=max_samples) for step in self.STEPS}
+        self._lock = threading.Lock()
+
+    def add(self, step, seconds):
+        """Records one sample for a step"""
+        with self._lock:
+            self.samples[step].append(seconds)
+
+    def add_many(self, samples):
+        """Records (step, seconds) pairs under a single lock acquisition"""
+        with self._lock:
+            for step, seconds in samples:
+                self.samples[step].append(seconds)
+
+    @contextmanager
+    def measure(self, step):
+        """Times the enclosed block as one sample of step"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(step, time.perf_counter() - start)
+
+    def summary(self):
+        """Returns count, mean, p50/p95/p99 and max per step, in milliseconds"""
+        with self._lock:
+            copies = {step: list(samples) for step, samples in self.samples.items()}
+        result = {}
+        for step, samples in copies.items():
+            ordered = sorted(samples)
+            count = len(ordered)
+            result[step] = {
+                'count': count,
+                'mean_ms': sum(ordered) / count * 1000 if count else 0.0,
+                'p50_ms': percentile(ordered, 50) * 1000,
+                'p95_ms': percentile(ordered, 95) * 1000,
+                'p99_ms': percentile(ordered, 99) * 1000,
+                'max_ms': ordered[-1] * 1000 if count else 0.0
+            }
+        return result
+
+    def export(self, path):
+        """Writes the summary to a JSON file"""
+        data = {
+            'exported_at': datetime.now().isoformat(),
+            'steps': self.summary()
+        }
+        with open(path, 'w') as f:
+            json.dump(data, f, indent=4)
+        return path
+
+    def reset(self):
+        """Drops all samples"""
+        with self._lock:
+            for samples in self.samples.values():
+                samples.clear()
+
+# ==================== CYCLE METRICS ====================
+class CycleMetrics:
+    """Rolling throughput, error rate and cycle-time percentiles.
+
+    The end time, outcome and duration bucket of each cycle are stored in
+    fixed-size arrays used as a ring buffer, so memory stays constant no
+    matter how long the bot runs. When a cycle is recorded, cycles older
+    than window seconds are evicted, as is the oldest cycle once the ring
+    is full. Running counts and a log-scale histogram of durations are
+    updated as cycles enter and leave, so rollup() never rescans the
+    history. Percentiles are accurate to one histogram bucket (about 9%).
+    """
+
+    MIN_DURATION = 0.001
+    BUCKETS_PER_DOUBLING = 8
+    BUCKETS = BUCKETS_PER_DOUBLING * 20
+
+    def __init__(self, capacity=METRICS_CAPACITY, window=METRICS_WINDOW):
+        self.capacity = capacity
+        self.window = window
+        self.ended_at = array('d', [0.0]) * capacity
+        self.outcomes = array('b', [0]) * capacity
+        self.bucket_of = array('H', [0]) * capacity
+        self.histogram = array('l', [0]) * self.BUCKETS
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self, started_at=None):
+        """Empties the buffer; started_at is the clock reading the run started at"""
+        with self._lock:
+            self.head = 0
+            self.size = 0
+            self.successes = 0
+            self.window_start = started_at
+            self.last_at = None
+            for i in range(self.BUCKETS):
+                self.histogram[i] = 0
+
+    def _bucket(self, duration):
+        if duration <= self.MIN_DURATION:
+            return 0
+        return min(self.BUCKETS - 1, int(math.log2(duration / self.MIN_DURATION) * self.BUCKETS_PER_DOUBLING))
+
+    def _bucket_limit(self, bucket):
+        """Upper bound of a histogram bucket, in seconds"""
+        return self.MIN_DURATION * 2 ** ((bucket + 1) / self.BUCKETS_PER_DOUBLING)
+
+    def _evict_oldest(self):
+        tail = (self.head - self.size) % self.capacity
+        self.successes -= self.outcomes[tail]
+        self.histogram[self.bucket_of[tail]] -= 1
+        self.window_start = self.ended_at[tail]
+        self.size -= 1
+
+    def record(self, at, duration, ok):
+        """Adds a cycle that ended at clock reading at and took duration seconds"""
+        with self._lock:
+            if self.window_start is None:
+                self.window_start = at - duration
+            cutoff = at - self.window
+            while self.size and (self.size == self.capacity
+                                 or self.ended_at[(self.head - self.size) % self.capacity] <= cutoff):
+                self._evict_oldest()
+            
+            bucket = self._bucket(duration)
+            head = self.head
+            self.ended_at[head] = at
+            self.outcomes[head] = 1 if ok else 0
+            self.bucket_of[head] = bucket
+            self.histogram[bucket] += 1
+            self.successes += 1 if ok else 0
+            self.head = (head + 1) % self.capacity
+            self.size += 1
+            self.last_at = at
+
+    def _percentile(self, pct):
+        rank = max(1, math.ceil(pct / 100 * self.size))
+        seen = 0
+        for bucket, count in enumerate(self.histogram):
+            seen += count
+            if seen >= rank:
+                return self._bucket_limit(bucket)
+        return self._bucket_limit(self.BUCKETS - 1)
+
+    def rollup(self):
+        """Snaps/minute, error rate and cycle-time percentiles (seconds) over the window"""
+        with self._lock:
+            if not self.size:
+                return {'window_s': 0.0, 'cycles': 0, 'snaps_per_minute': 0.0, 'error_rate': 0.0,
+                        'p50_s': 0.0, 'p95_s': 0.0, 'p99_s': 0.0}
+            span = self.last_at - self.window_start
+            return {
+                'window_s': span,
+                'cycles': self.size,
+                'snaps_per_minute': self.successes / span * 60 if span > 0 else 0.0,
+                'error_rate': (self.size - self.successes) / self.size,
+                'p50_s': self._percentile(50),
+                'p95_s': self._percentile(95),
+                'p99_s': self._percentile(99)
+            }
+
+# ==================== CYCLE SCHEDULER ====================
+class CycleScheduler:
+    """Drift-free cycle scheduler built on monotonic deadlines.
+
+    Each cycle's deadline is the previous deadline plus that cycle's
+    period, so the time spent moving, clicking, rendering and saving is
+    absorbed by the final wait instead of stretching the period. If a
+    cycle leaves less than min_gap before its deadline, the schedule
+    re-anchors so that min_gap is still waited: the overrun is counted,
+    and no catch-up burst of back-to-back cycles follows.
+
+    clock should exclude paused time (see AdvancedSnapBot.active_clock),
+    so a pause shifts the schedule rather than showing up as an overrun.
+    """
+
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self.started_at = None
+        self.finished_at = None
+        self.deadline = None
+        self.cycles = 0
+        self.successes = 0
+        self.overruns = 0
+
+    def start(self):
+        """Anchors the schedule on the current time"""
+        self.started_at = self.deadline = self.clock()
+        self.finished_at = None
+        self.cycles = self.successes = self.overruns = 0
+
+    def begin_cycle(self):
+        """Marks the start of a cycle, returns how late it started (jitter)"""
+        return max(0.0, self.clock() - self.deadline)
+
+    def end_cycle(self, success):
+        """Counts a finished cycle"""
+        self.cycles += 1
+        if success:
+            self.successes += 1
+
+    def wait_next(self, period, sleep, min_gap=0.0):
+        """Sleeps until the next deadline, and at least min_gap. Returns False if the sleep was interrupted"""
+        self.deadline += period
+        now = self.clock()
+        remaining = self.deadline - now
+        if remaining < min_gap or remaining <= 0:
+            self.overruns += 1
+            self.deadline = now + min_gap
+            if min_gap <= 0:
+                return True
+            remaining = min_gap
+        return sleep(remaining)
+
+    def reanchor(self):
+        """Restarts the schedule from the current time, e.g. after a failed cycle"""
+        self.deadline = self.clock()
+
+    def finish(self):
+        """Marks the end of the run, so elapsed() stops growing"""
+        if self.started_at is not None and self.finished_at is None:
+            self.finished_at = self.clock()
+
+    def elapsed(self):
+        """Seconds from start() to finish(), or to now while running, on the scheduler's clock"""
+        if self.started_at is None:
+            return 0.0
+        end = self.finished_at if self.finished_at is not None else self.clock()
+        return end - self.started_at
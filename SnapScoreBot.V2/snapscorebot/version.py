@@ -0,0 +1,61 @@
+"""Background check for a newer release"""
+
+import time
+import json
+import threading
+
+from .lazy import LazyModule
+from .settings import VERSION, VERSION_URL, VERSION_CACHE_TTL
+
+# requests is only imported when a check actually goes to the network
+requests = LazyModule('requests')
+
+# ==================== VERSION CHECK ====================
+class VersionChecker:
+    """Checks for new versions on a background thread.
+
+    The result is cached in cache_file for VERSION_CACHE_TTL
+    seconds, so most starts make no request at all and none wait for one.
+    """
+
+    def __init__(self, cache_file, ttl=VERSION_CACHE_TTL):
+        self.cache_file = cache_file
+        self.ttl = ttl
+        self.latest = None
+        self._thread = None
+
+    def start(self):
+        """Uses the cached result if it is fresh, otherwise fetches in the background"""
+        self.latest = self._read_cache()
+        if self.latest is None:
+            self._thread = threading.Thread(target=self._fetch, name="version-check", daemon=True)
+            self._thread.start()
+
+    def update_available(self):
+        """True once a newer version than VERSION is known"""
+        return self.latest is not None and self.latest != VERSION
+
+    def _read_cache(self):
+        try:
+            with open(self.cache_file, 'r') as f:
+                data = json.load(f)
+            if time.time() - data['checked_at'] < self.ttl:
+                return data['latest']
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+        return None
+
+    def _fetch(self):
+        try:
+            r = requests.get(VERSION_URL, timeout=3)
+            r.raise_for_status()
+            latest = r.text.strip()
+        except Exception:
+            # Offline or unreachable: not cached, so the next start tries again
+            return
+        self.latest = latest
+        try:
+            with open(self.cache_file, 'w') as f:
+                json.dump({'checked_at': time.time(), 'latest': latest}, f)
+        except OSError:
+            pass